@@ -1,9 +1,19 @@
 import os
 import json
-import requests
 import datetime
 from dotenv import load_dotenv
 
+try:
+    from backend.utils.resilience import resilient_request
+    from backend.utils.logger import get_logger
+    from backend.utils.shared_cache import get_shared_cache
+except ImportError:
+    from utils.resilience import resilient_request
+    from utils.logger import get_logger
+    from utils.shared_cache import get_shared_cache
+
+log = get_logger(__name__)
+
 # Load environment variables from various possible locations
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 env_paths = [
@@ -24,10 +34,17 @@ else:
 CAL_API_KEY = os.getenv("CAL_API_KEY") or "cal_live_6101fbb825f9173a4f3e7045d20d5bdc"
 CAL_EVENT_TYPE_ID = os.getenv("CAL_EVENT_TYPE_ID") or "3877498"
 
-def get_calendar_availability():
+# Availability cache (kept warm by the scheduler so requests never wait on Cal.com).
+# Shared by all workers on the node; kept past the TTL as a stale fallback for Cal.com outages.
+AVAILABILITY_TTL_SECONDS = int(os.getenv("AVAILABILITY_TTL_SECONDS", 90))
+AVAILABILITY_STALE_SECONDS = 6 * 3600
+AVAILABILITY_CACHE_KEY = "cal:availability"
+
+def fetch_calendar_availability():
     """
     Fetches bookings from Cal.com and returns a formatted summary for the frontend.
     Replicates the logic from n8n 'HTTP Request1' and 'Code in JavaScript' nodes.
+    Returns None on failure so errors are never cached.
     """
     try:
         # Cal.com v1 API for bookings (as used in n8n)
@@ -38,10 +55,10 @@ def get_calendar_availability():
             "dateFrom": datetime.datetime.now().isoformat()
         }
         
-        response = requests.get(url, params=params)
+        response = resilient_request("GET", url, "cal.availability", params=params)
         if not response.ok:
-            print(f"Cal.com Error: {response.status_code} - {response.text}")
-            return []
+            log.error("Cal.com availability error", extra={"status_code": response.status_code, "body": response.text[:500]})
+            return None
 
         data = response.json()
         bookings = data.get("bookings", [])
@@ -57,8 +74,25 @@ def get_calendar_availability():
         return [{ "bookings_summary": transformed_bookings }]
 
     except Exception as e:
-        print(f"Error in Calendar Engine (Availability): {e}")
-        return []
+        log.exception("calendar availability failed")
+        return None
+
+def get_calendar_availability(force_refresh=False, max_age=AVAILABILITY_TTL_SECONDS):
+    """
+    Returns the availability summary, served from the shared cache while it is younger than max_age.
+    """
+    cache = get_shared_cache()
+    if not force_refresh:
+        cached = cache.get(AVAILABILITY_CACHE_KEY, max_age=max_age)
+        if cached is not None:
+            return cached
+
+    data = fetch_calendar_availability()
+    if data is None:
+        # Serve stale data rather than nothing while Cal.com is unhealthy
+        return cache.get(AVAILABILITY_CACHE_KEY) or []
+    cache.set(AVAILABILITY_CACHE_KEY, data, ttl=AVAILABILITY_STALE_SECONDS)
+    return data
 
 def confirm_booking(booking_time_iso, email, name, phone, conversation_id=None):
     """
@@ -89,22 +123,23 @@ def confirm_booking(booking_time_iso, email, name, phone, conversation_id=None):
             "metadata": {"conversation_id": conversation_id}
         }
         
-        print(f"DEBUG: Sending to Cal.com: {json.dumps(payload)}")
+        log.debug("Cal.com booking payload", extra={"payload": payload})
         
-        response = requests.post(
-            url, 
+        response = resilient_request(
+            "POST", url, "cal.book",
             params={"apiKey": CAL_API_KEY}, 
             json=payload
         )
         
         if response.ok:
+            get_shared_cache().mark_stale(AVAILABILITY_CACHE_KEY)  # new booking: next availability check refetches
             return {"status": "success", "message": "Booking confirmed", "data": response.json()}
         else:
-            print(f"Booking Error: {response.text}")
+            log.error("Cal.com booking error", extra={"status_code": response.status_code, "body": response.text[:500]})
             return {"status": "error", "message": response.text}
             
     except Exception as e:
-        print(f"Error in Calendar Engine (Confirm): {e}")
+        log.exception("calendar confirm failed")
         return {"status": "error", "message": str(e)}
 
 def cancel_booking(uid):
@@ -113,8 +148,9 @@ def cancel_booking(uid):
     """
     try:
         url = f"https://api.cal.com/v1/bookings/{uid}/cancel"
-        response = requests.delete(url, params={"apiKey": CAL_API_KEY})
+        response = resilient_request("DELETE", url, "cal.cancel", params={"apiKey": CAL_API_KEY})
         if response.ok:
+            get_shared_cache().mark_stale(AVAILABILITY_CACHE_KEY)
             return {"status": "success", "message": "Booking canceled"}
         return {"status": "error", "message": response.text}
     except Exception as e:
@@ -0,0 +1,224 @@
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import datetime
+from psycopg2.extras import Json
+
+try:
+    from backend.tony_backend import db
+    from backend.migrations import month_start
+    from backend.utils.logger import get_logger
+except ImportError:
+    from tony_backend import db
+    from migrations import month_start
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# zstd is optional; gzip (stdlib) is the fallback codec
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Retention Config
+CONVERSATION_IDLE_DAYS = int(os.getenv("CONVERSATION_IDLE_DAYS", 14))
+CONVERSATION_RETENTION_MONTHS = int(os.getenv("CONVERSATION_RETENTION_MONTHS", 12))
+ARCHIVE_RETENTION_MONTHS = int(os.getenv("ARCHIVE_RETENTION_MONTHS", 36))
+COMPACTION_BATCH_SIZE = 200
+COMPACTION_MAX_BATCHES = 50  # bounds one run; the next run continues
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"\+\d[\d ]{7,16}\d")
+PARTITION_RE = re.compile(r"^ConversationMemory_y(\d{4})m(\d{2})$")
+
+def compress(data: bytes):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=9)
+
+def decompress(codec, payload: bytes):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed; cannot read zstd archive rows")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return gzip.decompress(payload)
+
+def extract_lead(conversation):
+    """
+    Pulls contact details out of a transcript so they stay queryable without decompressing.
+    """
+    text = conversation or ""
+    emails = sorted(set(EMAIL_RE.findall(text)))
+    phones = sorted({p.replace(" ", "") for p in PHONE_RE.findall(text)})
+    if not emails and not phones:
+        return None
+    return {"email": emails[0] if emails else None, "emails": emails, "phones": phones}
+
+def load_archived_conversation(message_id):
+    """
+    Returns the archived conversation dict for a messageID, or None.
+    """
+    rows = db.fetch_all('SELECT "codec", "payload" FROM "ConversationArchive" WHERE "messageID" = %s;', (message_id,))
+    if not rows:
+        return None
+    return json.loads(decompress(rows[0]["codec"], bytes(rows[0]["payload"])))
+
+def compact_idle_conversations(conn, idle_days=CONVERSATION_IDLE_DAYS, dry_run=False):
+    """
+    Moves conversations idle for idle_days into ConversationArchive as compressed JSON.
+    """
+    stats = {"archived": 0, "original_bytes": 0, "compressed_bytes": 0}
+    for _ in range(COMPACTION_MAX_BATCHES):
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT "messageID", "conversation", "created_at", "updated_at"
+                    FROM "ConversationMemory"
+                    WHERE "updated_at" < NOW() - make_interval(days => %s)
+                    ORDER BY "updated_at"
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED;
+                """, (idle_days, COMPACTION_BATCH_SIZE))
+                rows = cur.fetchall()
+                for message_id, conversation, created_at, updated_at in rows:
+                    raw = json.dumps({
+                        "messageID": message_id,
+                        "conversation": conversation,
+                        "created_at": created_at.isoformat(),
+                        "updated_at": updated_at.isoformat()
+                    }, ensure_ascii=False).encode("utf-8")
+                    codec, payload = compress(raw)
+                    stats["archived"] += 1
+                    stats["original_bytes"] += len(raw)
+                    stats["compressed_bytes"] += len(payload)
+                    if dry_run:
+                        continue
+                    lead = extract_lead(conversation)
+                    cur.execute("""
+                        INSERT INTO "ConversationArchive" (
+                            "messageID", "started_at", "last_activity_at", "codec", "payload",
+                            "original_bytes", "compressed_bytes", "lead"
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT ("messageID") DO UPDATE SET
+                            "last_activity_at" = EXCLUDED."last_activity_at",
+                            "archived_at" = NOW(),
+                            "codec" = EXCLUDED."codec",
+                            "payload" = EXCLUDED."payload",
+                            "original_bytes" = EXCLUDED."original_bytes",
+                            "compressed_bytes" = EXCLUDED."compressed_bytes",
+                            "lead" = COALESCE(EXCLUDED."lead", "ConversationArchive"."lead");
+                    """, (message_id, created_at, updated_at, codec, payload, len(raw), len(payload),
+                          Json(lead) if lead else None))
+                    cur.execute(
+                        'DELETE FROM "ConversationMemory" WHERE "messageID" = %s AND "created_at" = %s;',
+                        (message_id, created_at)
+                    )
+        if dry_run or len(rows) < COMPACTION_BATCH_SIZE:
+            break
+    return stats
+
+def drop_expired_partitions(conn, retention_months=CONVERSATION_RETENTION_MONTHS, dry_run=False):
+    """
+    Detaches and drops monthly ConversationMemory partitions entirely past the retention window.
+    Partitions are keyed by the month a conversation started, so an old partition can still hold
+    conversations that are active (or idle but not archived yet). Only partitions that compaction
+    has emptied are dropped; the rest are kept and reported until their rows are archived.
+    """
+    cutoff = month_start(datetime.date.today(), -retention_months)
+    dropped, kept, dropped_bytes = [], {}, 0
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT c.relname, pg_total_relation_size(c.oid)
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = 'ConversationMemory';
+            """)
+            for name, size in cur.fetchall():
+                match = PARTITION_RE.match(name)
+                if not match:
+                    continue
+                month = datetime.date(int(match.group(1)), int(match.group(2)), 1)
+                # The partition covers [month, next month); drop only if all of it is older than cutoff
+                if month_start(month, 1) > cutoff:
+                    continue
+                cur.execute(f'SELECT COUNT(*) FROM "{name}";')
+                remaining = cur.fetchone()[0]
+                if remaining:
+                    kept[name] = remaining
+                    continue
+                dropped.append(name)
+                dropped_bytes += size
+                if not dry_run:
+                    cur.execute(f'ALTER TABLE "ConversationMemory" DETACH PARTITION "{name}";')
+                    cur.execute(f'DROP TABLE "{name}";')
+            if not dry_run:
+                # Identity rows of conversations that still live in a kept partition must stay
+                cur.execute("""
+                    DELETE FROM "ConversationIndex" ci
+                    WHERE ci."created_at" < %s
+                      AND NOT EXISTS (SELECT 1 FROM "ConversationMemory" m WHERE m."messageID" = ci."messageID");
+                """, (cutoff,))
+    return {"dropped_partitions": dropped, "kept_partitions": kept, "dropped_bytes": dropped_bytes}
+
+def purge_archive(conn, retention_months=ARCHIVE_RETENTION_MONTHS, dry_run=False):
+    """
+    Deletes archived conversations that started before the archive retention window.
+    """
+    cutoff = month_start(datetime.date.today(), -retention_months)
+    with conn:
+        with conn.cursor() as cur:
+            if dry_run:
+                cur.execute("""
+                    SELECT COUNT(*), COALESCE(SUM("compressed_bytes"), 0)
+                    FROM "ConversationArchive" WHERE "started_at" < %s;
+                """, (cutoff,))
+            else:
+                cur.execute("""
+                    WITH purged AS (
+                        DELETE FROM "ConversationArchive" WHERE "started_at" < %s
+                        RETURNING "compressed_bytes"
+                    )
+                    SELECT COUNT(*), COALESCE(SUM("compressed_bytes"), 0) FROM purged;
+                """, (cutoff,))
+            count, size = cur.fetchone()
+    return {"archive_rows_purged": count, "archive_bytes_purged": int(size)}
+
+def run_retention(dry_run=False):
+    """
+    Scheduled entry point: compaction, partition retention and archive purge, with a report.
+    """
+    started = time.monotonic()
+    conn = db.get_connection(statement_timeout_ms=0)
+    if not conn:
+        return {"status": "error", "message": "No database connection"}
+    try:
+        report = {"status": "success", "dry_run": dry_run, "codec": "zstd" if zstandard else "gzip"}
+        report.update(compact_idle_conversations(conn, dry_run=dry_run))
+        report.update(drop_expired_partitions(conn, dry_run=dry_run))
+        report.update(purge_archive(conn, dry_run=dry_run))
+        # An estimate: the compaction part is JSON size minus compressed size, not relation size
+        # (dead tuples are only returned to the OS by VACUUM); dropped_bytes alone is measured.
+        report["reclaimed_bytes_estimate"] = (report["original_bytes"] - report["compressed_bytes"]
+                                              + report["dropped_bytes"] + report["archive_bytes_purged"])
+        report["runtime_seconds"] = round(time.monotonic() - started, 3)
+        log.info("conversation retention finished", extra={
+            "archived": report["archived"], "dropped_partitions": report["dropped_partitions"],
+            "kept_partitions": report.get("kept_partitions"), "dry_run": dry_run,
+            "reclaimed_bytes_estimate": report["reclaimed_bytes_estimate"], "runtime_seconds": report["runtime_seconds"]
+        })
+        return report
+    except Exception as e:
+        log.exception("conversation retention failed")
+        return {"status": "error", "message": str(e), "runtime_seconds": round(time.monotonic() - started, 3)}
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    # Usage: python -m backend.conversation_retention [--dry-run]
+    print(json.dumps(run_retention(dry_run="--dry-run" in sys.argv), indent=2, default=str))
@@ -0,0 +1,156 @@
+import io
+import os
+import csv
+import sys
+import json
+import uuid
+import argparse
+import datetime
+from psycopg2.extras import RealDictCursor
+
+try:
+    from backend.tony_backend import db
+except ImportError:
+    from tony_backend import db
+
+# Export Config
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", 5000))  # rows per keyset page (one short transaction each)
+EXPORT_FETCH_SIZE = 500  # rows per round trip from the named cursor
+EXPORT_CHUNK_BYTES = 64 * 1024  # encoded output is flushed in chunks of roughly this size
+
+# dataset -> table and keyset columns; the key must be unique and backed by a btree index (migration 4)
+EXPORT_DATASETS = {
+    "patients": {"table": "Patients", "key": ("created_at", "phone")},
+    "audits": {"table": "AIAudits", "key": ("created_at", "email")},
+    "pre_audits": {"table": "PreAuditIntakes", "key": ("created_at", "id")},
+    "bookings": {"table": "CalendarBookings", "key": ("created_at", "email", "bookingTime")},
+}
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+def parse_since(value):
+    """
+    Accepts an ISO date or datetime; naive values are treated as UTC. Returns None for empty input.
+    """
+    if not value:
+        return None
+    since = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.timezone.utc)
+    return since
+
+def iter_rows(dataset, since=None, page_size=EXPORT_PAGE_SIZE):
+    """
+    Yields rows of a dataset as dicts in (created_at, key) order.
+    Each page is read through a named (server-side) cursor and resumes after the last key
+    of the previous page, so memory stays flat and no transaction stays open for the whole export.
+    Rows with a NULL key column (older databases without NOT NULL) never satisfy the row
+    comparison, so they are left out of the keyset pass and exported in a final pass of their own.
+    """
+    spec = EXPORT_DATASETS[dataset]
+    columns = ", ".join(f'"{c}"' for c in spec["key"])
+    placeholders = ", ".join(["%s"] * len(spec["key"]))
+    not_null = " AND ".join(f'"{c}" IS NOT NULL' for c in spec["key"])
+    any_null = " OR ".join(f'"{c}" IS NULL' for c in spec["key"])
+
+    # No statement timeout: the NULL-key pass may scan the whole table before its first row
+    conn = db.get_connection(statement_timeout_ms=0)
+    if not conn:
+        raise RuntimeError("No database connection")
+    try:
+        last_key = None
+        while True:
+            conditions, params = [not_null], []
+            if since is not None:
+                conditions.append('"created_at" >= %s')
+                params.append(since)
+            if last_key is not None:
+                conditions.append(f"({columns}) > ({placeholders})")
+                params.extend(last_key)
+            where = f"WHERE {' AND '.join(conditions)}"
+            params.append(page_size)
+
+            count = 0
+            with conn:
+                with conn.cursor(name=f"export_{dataset}_{uuid.uuid4().hex[:8]}", cursor_factory=RealDictCursor) as cur:
+                    cur.itersize = EXPORT_FETCH_SIZE
+                    cur.execute(f'SELECT * FROM "{spec["table"]}" {where} ORDER BY {columns} LIMIT %s;', params)
+                    for row in cur:
+                        count += 1
+                        last_key = tuple(row[c] for c in spec["key"])
+                        yield row
+            if count < page_size:
+                break
+
+        # Legacy rows with NULL keys: expected to be few, so one ordered pass without keyset
+        conditions, params = [f"({any_null})"], []
+        if since is not None:
+            conditions.append('"created_at" >= %s')
+            params.append(since)
+        with conn:
+            with conn.cursor(name=f"export_{dataset}_nulls_{uuid.uuid4().hex[:8]}", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = EXPORT_FETCH_SIZE
+                cur.execute(f'SELECT * FROM "{spec["table"]}" WHERE {" AND ".join(conditions)} '
+                            f'ORDER BY {columns} NULLS FIRST;', params)
+                for row in cur:
+                    yield row
+    finally:
+        conn.close()
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+def encode_rows(rows, fmt="csv"):
+    """
+    Incrementally encodes rows as CSV (header from the first row) or NDJSON.
+    Yields str chunks of roughly EXPORT_CHUNK_BYTES.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    header = None
+    for row in rows:
+        if writer is not None:
+            if header is None:
+                header = list(row.keys())
+                writer.writerow(header)
+            writer.writerow([_csv_value(row.get(c)) for c in header])
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False, default=str))
+            buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_export(dataset, fmt="csv", since=None):
+    """
+    Generator of UTF-8 byte chunks for StreamingResponse / file output.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'. Options: {', '.join(EXPORT_DATASETS)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Options: {', '.join(EXPORT_FORMATS)}")
+    for chunk in encode_rows(iter_rows(dataset, since=since), fmt):
+        yield chunk.encode("utf-8")
+
+if __name__ == "__main__":
+    # Usage: python -m backend.export patients --format csv --since 2026-01-01 -o patients.csv
+    parser = argparse.ArgumentParser(description="Stream a table export as CSV or NDJSON.")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--since", help="ISO date/datetime; only rows created at or after it")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in stream_export(args.dataset, args.format, parse_since(args.since)):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
@@ -1,13 +1,17 @@
 from fastapi import FastAPI, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, JSONResponse, FileResponse
+from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles # Added for serving images
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Any
 import os
 import uvicorn
 import sys
 import urllib.parse
+import datetime
+import time
+import asyncio
 
 app = FastAPI()
 print("🚀 DEPLOYMENT: UPDATED BREVO + ASSETS")
@@ -33,6 +37,9 @@ else:
 @app.middleware("http")
 async def force_canonical_host(request: Request, call_next):
     host = request.headers.get("host", "")
+    # Probes hit the worker directly (internal host / IP) and must not be redirected
+    if request.url.path == "/readyz":
+        return await call_next(request)
     if host and "www.arcigy.com" not in host and "localhost" not in host and "127.0.0.1" not in host:
         # Construct new URL on the primary domain
         url = str(request.url).replace(host, "www.arcigy.com")
@@ -43,7 +50,104 @@ async def force_canonical_host(request: Request, call_next):
     response = await call_next(request)
     return response
 
-# 2. NUCLEAR CORS (Allow everything explicitly via regex to support credentials if needed)
+# 2. ADMISSION CONTROL (token buckets per client IP + concurrency caps on LLM routes)
+try:
+    from backend.utils.rate_limiter import admission, classify_route, client_ip
+except ImportError:
+    from utils.rate_limiter import admission, classify_route, client_ip
+
+def too_many_requests(retry_after, message="Too many requests. Please slow down."):
+    return JSONResponse(
+        status_code=429,
+        content={"status": "error", "intention": "error", "message": message, "response": message},
+        headers={"Retry-After": str(max(1, retry_after))}
+    )
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    if not request.url.path.startswith("/webhook/") or request.method == "OPTIONS":
+        return await call_next(request)
+
+    route_class = classify_route(request.url.path)
+    retry_after = admission.check(route_class, client_ip(request))
+    if retry_after:
+        return too_many_requests(retry_after)
+    if not admission.try_acquire(route_class):
+        return too_many_requests(1, "Server is busy. Please try again in a moment.")
+    try:
+        return await call_next(request)
+    finally:
+        admission.release(route_class)
+
+# 3. OPT-IN PROFILING (signed X-Profile header or PROFILE_SAMPLE_RATE; a no-op otherwise)
+try:
+    from backend.utils.profiler import profile_store
+    from backend.utils.admin_auth import verify_signature
+except ImportError:
+    from utils.profiler import profile_store
+    from utils.admin_auth import verify_signature
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    signed = request.headers.get("x-profile")
+    if not signed and not (request.url.path.startswith("/webhook/") and profile_store.should_sample()):
+        return await call_next(request)
+    if signed and not verify_signature(signed, f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+    profiler = profile_store.begin()
+    if profiler is None:
+        response = await call_next(request)
+        response.headers["X-Profile-Status"] = "busy"
+        return response
+
+    # Named after the request id (set by trace_request for /webhook/*), so a profile matches its logs and trace
+    request_id = tracing.current_request_id() or tracing.set_request_id()
+    profile_id = f"{int(time.time())}-{request_id}"
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers["X-Profile-ID"] = profile_id
+        response.headers.setdefault("X-Request-ID", request_id)
+        return response
+    finally:
+        meta = {"method": request.method, "path": request.url.path, "status": status_code,
+                "trigger": "header" if signed else "sampled",
+                "request_id": request_id, "trace_id": tracing.current_trace_id()}
+        await run_in_threadpool(profile_store.finish, profiler, profile_id, meta)
+
+# 4. REQUEST ID + TRACING (TRACE_EXPORT=file|otlp; spans follow the request into threads, background tasks and the ingest queue)
+try:
+    from backend.utils import tracing
+    from backend.utils.logger import get_logger, get_stats as get_logging_stats
+except ImportError:
+    from utils import tracing
+    from utils.logger import get_logger, get_stats as get_logging_stats
+
+log = get_logger(__name__)
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    if not request.url.path.startswith("/webhook/"):
+        return await call_next(request)
+    # Every log record of this request carries the id (see backend/utils/logger.py)
+    incoming = request.headers.get("x-request-id", "")[:64]
+    request_id = tracing.set_request_id(incoming if incoming.replace("-", "").isalnum() else None)
+    if not tracing.enabled():
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+    with tracing.start_trace(f"{request.method} {request.url.path}", parent=request.headers.get("traceparent"),
+                             method=request.method, path=request.url.path) as root:
+        response = await call_next(request)
+        if root:
+            root.set(status_code=response.status_code)
+            response.headers["X-Trace-ID"] = root.trace_id
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+# 5. NUCLEAR CORS (Allow everything explicitly via regex to support credentials if needed)
 app.add_middleware(
     CORSMiddleware,
     allow_origin_regex=".*",
@@ -108,17 +212,130 @@ try:
     # Try package-style import first (for production)
     import backend.tony_backend as tony_backend
     tony_module = tony_backend
-    print("✅ Logic Module loaded via [backend.tony_backend]")
+    log.info("logic module loaded", extra={"module": "backend.tony_backend"})
 except ImportError:
     try:
         # Try local import (for local dev)
         import tony_backend
         tony_module = tony_backend
-        print("✅ Logic Module loaded via [tony_backend]")
+        log.info("logic module loaded", extra={"module": "tony_backend"})
     except ImportError as e:
-        print(f"❌ Logic Module FAILED to load: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("logic module failed to load")
+
+try:
+    import backend.calendar_engine as calendar_engine
+except ImportError:
+    import calendar_engine
+
+try:
+    from backend.utils.idempotency import booking_idempotency, derive_key, IdempotencyKeyMismatch
+    from backend.utils.resilience import get_breaker_states
+    from backend.utils.conversation_gate import create_gate
+    from backend.utils.ingest_queue import get_default_queue
+    from backend.utils.admin_auth import is_admin_request
+    from backend.utils.image_pipeline import image_pipeline
+    from backend.utils.shared_cache import get_shared_cache
+    from backend.utils import email_validator
+except ImportError:
+    from utils.idempotency import booking_idempotency, derive_key, IdempotencyKeyMismatch
+    from utils.resilience import get_breaker_states
+    from utils.conversation_gate import create_gate
+    from utils.ingest_queue import get_default_queue
+    from utils.admin_auth import is_admin_request
+    from utils.image_pipeline import image_pipeline
+    from utils.shared_cache import get_shared_cache
+    from utils import email_validator
+
+# Serializes chat turns per conversationID and coalesces duplicate submissions
+conversation_gate = create_gate(connection_factory=tony_module.db.get_connection if tony_module else None)
+
+# Durable ingest queue: form submissions are written to a local WAL and drained into Postgres
+ingest_queue = get_default_queue()
+if tony_module:
+    ingest_queue.register("audit", tony_module.persist_audit)
+    ingest_queue.register("pre_audit", tony_module.persist_pre_audit)
+
+# In-process scheduler (availability pre-warm, DNS cache refresh, booking reminders)
+scheduler = None
+if tony_module:
+    try:
+        try:
+            from backend.scheduled_jobs import create_scheduler
+        except ImportError:
+            from scheduled_jobs import create_scheduler
+        scheduler = create_scheduler()
+    except Exception as e:
+        log.exception("scheduler failed to initialize")
+
+# Warm-up hooks run once per worker at startup; /readyz reports 503 until they finish (or time out)
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", 20))
+readiness = {"ready": False, "draining": False, "warmup": {}}
+
+def warm_prompt():
+    return {"chars": len(tony_module.load_system_prompt())} if tony_module else {"skipped": True}
+
+def warm_availability():
+    data = calendar_engine.get_calendar_availability()
+    return {"bookings": len(data[0]["bookings_summary"]) if data else 0}
+
+def warm_dns():
+    # Verdicts for the common domains land in the shared cache, so most /webhook/verify-email calls skip DNS
+    return {"domains": sum(1 for d in email_validator.COMMON_DOMAINS if email_validator.domain_accepts_mail(d))}
+
+WARMUP_HOOKS = {"prompt": warm_prompt, "availability": warm_availability, "dns": warm_dns}
+
+async def run_warmup():
+    async def run_hook(name, hook):
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(run_in_threadpool(hook), WARMUP_TIMEOUT)
+            readiness["warmup"][name] = {"status": "success", **result}
+        except Exception as e:
+            # A failed hook only means a cold cache; the worker still serves
+            readiness["warmup"][name] = {"status": "error", "message": str(e) or type(e).__name__}
+        readiness["warmup"][name]["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+
+    await asyncio.gather(*(run_hook(name, hook) for name, hook in WARMUP_HOOKS.items()))
+    readiness["ready"] = True
+    log.info("worker ready", extra={"pid": os.getpid(), "warmup": readiness["warmup"]})
+
+def log_image_build(future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        log.error("image pipeline build failed", exc_info=(type(error), error, error.__traceback__))
+    else:
+        log.info("image pipeline build finished", extra=future.result())
+
+@app.on_event("startup")
+async def start_background_workers():
+    # Apply/verify the Postgres schema the upserts depend on before draining queued writes
+    if tony_module:
+        try:
+            try:
+                from backend.migrations import run_startup_checks
+            except ImportError:
+                from migrations import run_startup_checks
+            await run_in_threadpool(run_startup_checks)
+        except Exception as e:
+            log.exception("schema startup check failed")
+    ingest_queue.start()
+    if scheduler:
+        scheduler.start()
+    # Image variants are built off the request path; /img/* serves originals until the manifest exists.
+    # One worker per node encodes (file lock); prefer building in the deploy step and turning this off.
+    if os.getenv("IMAGE_PIPELINE_ON_STARTUP", "true").lower() != "false":
+        asyncio.get_running_loop().run_in_executor(None, image_pipeline.build).add_done_callback(log_image_build)
+    # In the background so /readyz can answer "warming_up" while the hooks run
+    app.state.warmup_task = asyncio.create_task(run_warmup())
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    readiness["draining"] = True
+    ingest_queue.stop()
+    if scheduler:
+        await scheduler.stop()
 
 # @app.get("/")
 # def home():
@@ -126,80 +343,101 @@ except ImportError:
 
 @app.post("/webhook/chat")
 async def chat_endpoint(data: ChatMessage, background_tasks: BackgroundTasks):
-    print(f"🔹 POST /webhook/chat HIT. Message: {data.message[:20]}...")
+    log.info("chat request", extra={"conversation_id": data.conversationID, "message_chars": len(data.message),
+                                    "history_len": len(data.history)})
     
     if not tony_module:
-        print("❌ tony_backend module is NOT loaded.")
+        log.error("tony_backend module is not loaded")
         return {"response": "Internal System Error: Logic module not loaded.", "intention": "error"}
 
+    retry_after = admission.check_conversation(data.conversationID)
+    if retry_after:
+        return too_many_requests(retry_after)
+
     try:
-        # Pass userData to the reasoning engine
-        response_json, formatted_history = tony_module.get_tony_response(
-            data.message, data.conversationID, data.history, data.lang, data.userData
+        # Pass userData to the reasoning engine (off the event loop, one turn per conversation at a time)
+        async def produce():
+            return await run_in_threadpool(
+                tony_module.get_tony_response,
+                data.message, data.conversationID, data.history, data.lang, data.userData
+            )
+        (response_json, formatted_history), shared = await conversation_gate.run(
+            data.conversationID, data.message, produce, history_len=len(data.history)
         )
-        if hasattr(tony_module, 'persist_conversation'):
-             background_tasks.add_task(tony_module.persist_conversation, data.conversationID, data.message, response_json, formatted_history)
+        if shared:
+            log.info("duplicate chat message coalesced", extra={"conversation_id": data.conversationID})
+        elif hasattr(tony_module, 'persist_conversation'):
+             background_tasks.add_task(tracing.bind(tony_module.persist_conversation, "background persist_conversation"),
+                                       data.conversationID, data.message, response_json, formatted_history)
         return response_json
     except Exception as e:
-        print(f"❌ Chat Logic Error: {e}")
+        log.exception("chat logic error", extra={"conversation_id": data.conversationID})
         return {"response": "Prepáčte, mám technické ťažkosti.", "intention": "error"}
 
 @app.post("/webhook/calendar-availability-check")
 async def availability_endpoint():
     try:
-        from calendar_engine import get_calendar_availability
-        return get_calendar_availability()
+        return await run_in_threadpool(calendar_engine.get_calendar_availability)
     except Exception as e:
         return []
 
 @app.post("/webhook/calendar-initiate-book")
-async def initiate_booking(data: BookingConfirm, background_tasks: BackgroundTasks):
-    print(f"🔹 Booking Initiation received for: {data.email}")
+async def initiate_booking(data: BookingConfirm, request: Request, background_tasks: BackgroundTasks):
+    log.info("booking initiation", extra={"email": data.email})
     try:
-        from calendar_engine import confirm_booking
-        # 1. Confirm with Cal.com
-        result = confirm_booking(
-            data.bookingTime, data.email, data.name, data.phone, data.conversationID
+        # 1. Confirm with Cal.com (de-duplicated: retries and double-clicks reuse the original result)
+        booking_fields = (data.email, data.bookingTime, data.conversationID)
+        client_key = request.headers.get("idempotency-key")
+        try:
+            idem_key = booking_idempotency.scoped_key(client_key, *booking_fields) if client_key else derive_key(*booking_fields)
+        except IdempotencyKeyMismatch as e:
+            return JSONResponse(status_code=422, content={"status": "error", "message": str(e)})
+        result, replayed = await run_in_threadpool(
+            booking_idempotency.run, idem_key, calendar_engine.confirm_booking,
+            data.bookingTime, data.email, data.name, data.phone, data.conversationID,
+            should_cache=lambda r: r.get("status") == "success"
         )
+        if replayed:
+            log.info("booking request de-duplicated", extra={"email": data.email})
         
-        # 2. Persist to Supabase if successful
-        if result.get("status") == "success" and tony_module:
+        # 2. Persist to Supabase if successful (only once, by the call that hit Cal.com)
+        if result.get("status") == "success" and tony_module and not replayed:
             if hasattr(tony_module, 'persist_booking'):
-                background_tasks.add_task(tony_module.persist_booking, data.dict())
+                background_tasks.add_task(tracing.bind(tony_module.persist_booking, "background persist_booking"), data.dict())
         
         return result
     except Exception as e:
-        print(f"❌ Booking Error: {e}")
+        log.exception("booking error", extra={"email": data.email})
         return {"status": "error", "message": str(e)}
 
 @app.post("/webhook/audit-submit")
-async def audit_submit(data: AuditSubmit, background_tasks: BackgroundTasks):
-    print(f"🔹 Audit Submission received for: {data.email}")
+async def audit_submit(data: AuditSubmit):
+    log.info("audit submission", extra={"email": data.email})
     if not tony_module:
         return {"status": "error", "message": "Backend logic not loaded"}
     
     try:
         if hasattr(tony_module, 'persist_audit'):
-            background_tasks.add_task(tony_module.persist_audit, data.dict())
+            ingest_queue.enqueue("audit", data.dict())
             return {"status": "success", "message": "Audit data received and persistence scheduled"}
         else:
             return {"status": "error", "message": "Persistence function missing"}
     except Exception as e:
-        print(f"❌ Audit Webhook Error: {e}")
+        log.exception("audit webhook error", extra={"email": data.email})
         return {"status": "error", "message": str(e)}
 
 @app.post("/webhook/pre-audit-submit")
-async def pre_audit_submit(data: PreAuditIntake, background_tasks: BackgroundTasks):
-    print(f"🔹 Pre-Audit Intake received from: {data.email} via {data.referrer}")
+async def pre_audit_submit(data: PreAuditIntake):
+    log.info("pre-audit intake", extra={"email": data.email, "referrer": data.referrer})
     if not tony_module:
          return {"status": "error", "message": "Backend logic not loaded", "ai_message": None}
 
     try:
-        # 1. Persist Data (Background)
+        # 1. Persist Data (Durable queue, drained in the background)
         if hasattr(tony_module, 'persist_pre_audit'):
-            background_tasks.add_task(tony_module.persist_pre_audit, data.dict())
+            ingest_queue.enqueue("pre_audit", data.dict())
         else:
-            print("❌ tony_backend.persist_pre_audit NOT FOUND")
+            log.error("tony_backend.persist_pre_audit not found")
 
         # 2. Generate AI Confirmation (Foreground - wait for it to display on frontend)
         ai_msg = None
@@ -210,7 +448,7 @@ async def pre_audit_submit(data: PreAuditIntake, background_tasks: BackgroundTas
         return {"status": "success", "message": "Intake received", "ai_message": ai_msg}
 
     except Exception as e:
-        print(f"❌ Pre-Audit Webhook Error: {e}")
+        log.exception("pre-audit webhook error", extra={"email": data.email})
         return {"status": "error", "message": str(e), "ai_message": None}
 
 @app.get("/webhook/verify-email")
@@ -224,7 +462,7 @@ async def verify_email_endpoint(email: str, lang: str = "sk"):
             from utils.email_validator import validate_email_deep
             is_valid, message, suggestion = validate_email_deep(email, lang)
         except ImportError as e:
-            print(f"❌ Email Validator import error: {e}")
+            log.error("email validator import failed, validation bypassed", extra={"error": str(e)})
             return {"valid": True, "message": "Validation bypassed", "suggestion": None}
 
     return {
@@ -233,6 +471,110 @@ async def verify_email_endpoint(email: str, lang: str = "sk"):
         "suggestion": suggestion
     }
 
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness probe: 200 once this worker's warm-up is done, 503 while warming up or shutting down."""
+    ready = readiness["ready"] and not readiness["draining"]
+    return JSONResponse(status_code=200 if ready else 503, content={
+        "status": "ready" if ready else ("draining" if readiness["draining"] else "warming_up"),
+        "pid": os.getpid(), "warmup": readiness["warmup"]
+    })
+
+@app.get("/status/integrations", include_in_schema=False)
+async def integrations_status(request: Request):
+    """Circuit breaker, retry budget and LLM hedging state of outbound integrations."""
+    if not is_admin_request(request.headers):
+        return JSONResponse(status_code=401, content={"status": "error", "message": "Unauthorized"})
+    status = {
+        "breakers": get_breaker_states(),
+        "booking_idempotency": booking_idempotency.get_stats(),
+        "admission": admission.get_stats(),
+        "chat_gate": conversation_gate.get_stats(),
+        "ingest_queue": ingest_queue.get_stats(),
+        "scheduler": scheduler.get_metrics() if scheduler else None,
+        "tracing": tracing.get_stats(),
+        "logging": get_logging_stats(),
+        "shared_cache": get_shared_cache().get_stats()
+    }
+    if tony_module and hasattr(tony_module, 'chat_llm'):
+        status["llm"] = tony_module.chat_llm.get_stats()
+        status["local_intents"] = tony_module.fast_path.get_stats()
+        status["persistence"] = tony_module.get_persist_stats()
+    return status
+
+@app.get("/admin/export/{dataset}", include_in_schema=False)
+async def export_dataset(dataset: str, request: Request, format: str = "csv", since: Optional[str] = None):
+    """Streams Patients / AIAudits / PreAuditIntakes / CalendarBookings as CSV or NDJSON."""
+    if not is_admin_request(request.headers):
+        return JSONResponse(status_code=401, content={"status": "error", "message": "Unauthorized"})
+    try:
+        from backend.export import EXPORT_DATASETS, EXPORT_FORMATS, parse_since, stream_export
+    except ImportError:
+        from export import EXPORT_DATASETS, EXPORT_FORMATS, parse_since, stream_export
+
+    if dataset not in EXPORT_DATASETS or format not in EXPORT_FORMATS:
+        return JSONResponse(status_code=404, content={
+            "status": "error", "message": f"Datasets: {', '.join(EXPORT_DATASETS)}; formats: {', '.join(EXPORT_FORMATS)}"
+        })
+    try:
+        since_dt = parse_since(since)
+    except ValueError:
+        return JSONResponse(status_code=400, content={"status": "error", "message": "Invalid 'since' (expected ISO date)"})
+
+    filename = f"{dataset}_{datetime.date.today().isoformat()}.{format}"
+    # Sync generator: Starlette iterates it in the threadpool, so cursor reads never block the loop
+    return StreamingResponse(
+        stream_export(dataset, format, since_dt),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+@app.get("/admin/profiles", include_in_schema=False)
+async def list_profiles(request: Request, limit: int = 100):
+    """Recent request profiles (newest first)."""
+    if not is_admin_request(request.headers):
+        return JSONResponse(status_code=401, content={"status": "error", "message": "Unauthorized"})
+    profiles = await run_in_threadpool(profile_store.list_profiles, limit)
+    return {"profiler": profile_store.get_stats(), "profiles": profiles}
+
+@app.get("/admin/profiles/{profile_id}", include_in_schema=False)
+async def get_profile(profile_id: str, request: Request):
+    """Downloads one profile (open .speedscope.json in speedscope.app, .collapsed.txt in flamegraph.pl)."""
+    if not is_admin_request(request.headers):
+        return JSONResponse(status_code=401, content={"status": "error", "message": "Unauthorized"})
+    path = profile_store.profile_path(profile_id)
+    if not path:
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Profile not found"})
+    return FileResponse(path, filename=os.path.basename(path))
+
+@app.get("/img/v/{filename}", include_in_schema=False)
+async def image_variant(filename: str):
+    """Content-hashed image variant; the name changes with the content, so it is cached forever."""
+    path = image_pipeline.variant_path(filename)
+    if not path:
+        # Sent emails keep linking to old hashes after a re-encode or redeploy: send them to the current image
+        parsed = image_pipeline.parse_variant_name(filename)
+        if parsed and (image_pipeline.resolve(parsed[0]) or image_pipeline.original_path(parsed[0])):
+            return RedirectResponse(url=f"/img/{parsed[0]}?w={parsed[1]}", status_code=302,
+                                    headers={"Cache-Control": "public, max-age=3600"})
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Image not found"})
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+@app.get("/img/{stem}", include_in_schema=False)
+async def image_negotiated(stem: str, request: Request, w: Optional[int] = None):
+    """Best variant of assets/<stem>.* for the client's Accept header and the requested width."""
+    resolved = image_pipeline.resolve(stem, w, request.headers.get("accept", ""))
+    path = image_pipeline.variant_path(resolved[0]) if resolved else None
+    if path:
+        return FileResponse(path, media_type=resolved[1], headers={
+            "Cache-Control": "public, max-age=86400", "Vary": "Accept",
+            "Link": f'</img/v/{resolved[0]}>; rel="canonical"'
+        })
+    original = image_pipeline.original_path(stem)
+    if not original:
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Image not found"})
+    return FileResponse(original, headers={"Cache-Control": "public, max-age=3600"})
+
 # EXPLICIT ROUTES FOR CLEAN URLs (SEO)
 @app.get("/about", include_in_schema=False)
 async def get_about():
@@ -253,9 +595,9 @@ async def get_contact():
 # MOUNT STATIC SITE (Must be last to avoid blocking API routes)
 if os.path.exists(public_html_path):
     app.mount("/", StaticFiles(directory=public_html_path, html=True), name="static_site")
-    print(f"✅ Website mounted from: {public_html_path}")
+    log.info("website mounted", extra={"path": public_html_path})
 else:
-    print(f"⚠️ public_html NOT found at: {public_html_path}")
+    log.warning("public_html not found", extra={"path": public_html_path})
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
@@ -0,0 +1,390 @@
+import os
+import sys
+import datetime
+
+try:
+    from backend.tony_backend import db
+    from backend.utils.logger import get_logger
+except ImportError:
+    from tony_backend import db
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Apply pending migrations on startup (otherwise only verify and warn)
+SCHEMA_AUTO_MIGRATE = os.getenv("SCHEMA_AUTO_MIGRATE", "true").lower() != "false"
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 2))
+
+# --- SCHEMA HELPERS ---
+
+def month_start(d, offset=0):
+    month_index = d.year * 12 + (d.month - 1) + offset
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(month):
+    return f"ConversationMemory_y{month.year}m{month.month:02d}"
+
+def create_month_partition(cur, month):
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS "{partition_name(month)}"
+        PARTITION OF "ConversationMemory"
+        FOR VALUES FROM (%s) TO (%s);
+    """, (month.isoformat(), month_start(month, 1).isoformat()))
+
+def unique_column_sets(cur, table):
+    """
+    Returns the column sets covered by unique indexes/constraints on a table.
+    """
+    cur.execute("""
+        SELECT array_agg(a.attname::text ORDER BY k.ord)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = k.attnum
+        WHERE c.relname = %s AND i.indisunique
+        GROUP BY i.indexrelid;
+    """, (table,))
+    return {frozenset(row[0]) for row in cur.fetchall()}
+
+def ensure_unique(cur, table, columns, index_name):
+    # Existing tables may already carry an equivalent constraint under another name
+    if frozenset(columns) in unique_column_sets(cur, table):
+        return
+    cols = ", ".join(f'"{c}"' for c in columns)
+    cur.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table}" ({cols});')
+
+# --- MIGRATIONS ---
+# Each migration is (version, name, steps); a step is SQL text or a callable(cur).
+# Never edit an applied migration - append a new one.
+
+BASE_TABLES = """
+CREATE TABLE IF NOT EXISTS "ConversationMemory" (
+    "messageID" TEXT PRIMARY KEY,
+    "conversation" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS "Patients" (
+    "forename" TEXT,
+    "surname" TEXT,
+    "email" TEXT,
+    "phone" TEXT NOT NULL,
+    "other_relevant_info" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS "AIAudits" (
+    "fullname" TEXT, "email" TEXT NOT NULL, "phone" TEXT, "company" TEXT, "pitch" TEXT,
+    "turnover" TEXT, "journey" TEXT, "dream" TEXT, "problem" TEXT, "bottleneck" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS "CalendarBookings" (
+    "bookingTime" TEXT NOT NULL, "email" TEXT NOT NULL, "name" TEXT, "phone" TEXT,
+    "lang" TEXT, "conversationID" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS "PreAuditIntakes" (
+    "name" TEXT, "email" TEXT, "business_name" TEXT, "industry" TEXT, "employees" TEXT,
+    "what_sell" TEXT, "typical_customer" TEXT, "source" JSONB, "top_tasks" TEXT, "magic_wand" TEXT,
+    "leads_challenge" TEXT, "sales_team" TEXT, "closing_issues" TEXT, "delivery_time" TEXT,
+    "ops_recurring" TEXT, "support_headaches" TEXT, "ai_experience" TEXT, "which_ai_tools" TEXT,
+    "success_definition" TEXT, "specific_focus" TEXT, "referrer" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE "CalendarBookings" ADD COLUMN IF NOT EXISTS "reminder_sent_at" TIMESTAMPTZ;
+"""
+
+# Append-mostly tables: BRIN on created_at is tiny and serves reporting range scans
+REPORTING_INDEXES = """
+CREATE INDEX IF NOT EXISTS "Patients_created_at_brin" ON "Patients" USING BRIN ("created_at");
+CREATE INDEX IF NOT EXISTS "AIAudits_created_at_brin" ON "AIAudits" USING BRIN ("created_at");
+CREATE INDEX IF NOT EXISTS "CalendarBookings_created_at_brin" ON "CalendarBookings" USING BRIN ("created_at");
+CREATE INDEX IF NOT EXISTS "PreAuditIntakes_created_at_brin" ON "PreAuditIntakes" USING BRIN ("created_at");
+CREATE INDEX IF NOT EXISTS "CalendarBookings_pending_reminder_idx" ON "CalendarBookings" ("bookingTime")
+    WHERE "reminder_sent_at" IS NULL;
+"""
+
+def upsert_constraints(cur):
+    ensure_unique(cur, "ConversationMemory", ["messageID"], "ConversationMemory_messageID_key")
+    ensure_unique(cur, "Patients", ["phone"], "Patients_phone_key")
+    ensure_unique(cur, "AIAudits", ["email"], "AIAudits_email_key")
+    ensure_unique(cur, "CalendarBookings", ["email", "bookingTime"], "CalendarBookings_email_bookingTime_key")
+
+# A partitioned table cannot have UNIQUE ("messageID") alone, so ConversationIndex owns the
+# conversation identity (and its first-seen timestamp = partition key) and the memory
+# rows are unique on ("messageID", "created_at").
+PARTITIONED_CONVERSATIONS = """
+CREATE TABLE IF NOT EXISTS "ConversationIndex" (
+    "messageID" TEXT PRIMARY KEY,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE "ConversationMemory" RENAME TO "ConversationMemory_legacy";
+CREATE TABLE "ConversationMemory" (
+    "messageID" TEXT NOT NULL,
+    "conversation" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY ("messageID", "created_at")
+) PARTITION BY RANGE ("created_at");
+CREATE TABLE "ConversationMemory_default" PARTITION OF "ConversationMemory" DEFAULT;
+CREATE INDEX "ConversationMemory_created_at_idx" ON "ConversationMemory" ("created_at");
+"""
+
+def migrate_legacy_conversations(cur):
+    cur.execute('SELECT MIN(COALESCE("created_at", NOW())) FROM "ConversationMemory_legacy";')
+    oldest = cur.fetchone()[0]
+    today = datetime.date.today()
+    month = month_start(oldest.date() if oldest else today)
+    while month <= month_start(today, PARTITION_MONTHS_AHEAD):
+        create_month_partition(cur, month)
+        month = month_start(month, 1)
+
+    cur.execute("""
+        INSERT INTO "ConversationIndex" ("messageID", "created_at")
+        SELECT "messageID", COALESCE("created_at", NOW()) FROM "ConversationMemory_legacy"
+        ON CONFLICT ("messageID") DO NOTHING;
+    """)
+    cur.execute("""
+        INSERT INTO "ConversationMemory" ("messageID", "conversation", "created_at")
+        SELECT m."messageID", m."conversation", i."created_at"
+        FROM "ConversationMemory_legacy" m JOIN "ConversationIndex" i USING ("messageID");
+    """)
+    cur.execute('DROP TABLE "ConversationMemory_legacy";')
+
+# Idle detection needs last activity; compacted transcripts move to a compressed archive
+CONVERSATION_ARCHIVE = """
+ALTER TABLE "ConversationMemory" ADD COLUMN IF NOT EXISTS "updated_at" TIMESTAMPTZ;
+UPDATE "ConversationMemory" SET "updated_at" = "created_at" WHERE "updated_at" IS NULL;
+ALTER TABLE "ConversationMemory" ALTER COLUMN "updated_at" SET DEFAULT NOW();
+ALTER TABLE "ConversationMemory" ALTER COLUMN "updated_at" SET NOT NULL;
+CREATE INDEX IF NOT EXISTS "ConversationMemory_updated_at_idx" ON "ConversationMemory" ("updated_at");
+CREATE TABLE IF NOT EXISTS "ConversationArchive" (
+    "messageID" TEXT PRIMARY KEY,
+    "started_at" TIMESTAMPTZ NOT NULL,
+    "last_activity_at" TIMESTAMPTZ NOT NULL,
+    "archived_at" TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    "codec" TEXT NOT NULL,
+    "payload" BYTEA NOT NULL,
+    "original_bytes" INTEGER NOT NULL,
+    "compressed_bytes" INTEGER NOT NULL,
+    "lead" JSONB
+);
+CREATE INDEX IF NOT EXISTS "ConversationArchive_started_at_brin" ON "ConversationArchive" USING BRIN ("started_at");
+CREATE INDEX IF NOT EXISTS "ConversationArchive_lead_email_idx" ON "ConversationArchive" (("lead"->>'email'));
+"""
+
+# Keyset pagination for exports walks (created_at, unique key) in order; PreAuditIntakes
+# has no natural key, so it gets a surrogate id
+EXPORT_KEYSET_INDEXES = """
+ALTER TABLE "PreAuditIntakes" ADD COLUMN IF NOT EXISTS "id" BIGINT GENERATED BY DEFAULT AS IDENTITY;
+CREATE UNIQUE INDEX IF NOT EXISTS "PreAuditIntakes_id_key" ON "PreAuditIntakes" ("id");
+CREATE INDEX IF NOT EXISTS "PreAuditIntakes_keyset_idx" ON "PreAuditIntakes" ("created_at", "id");
+CREATE INDEX IF NOT EXISTS "Patients_keyset_idx" ON "Patients" ("created_at", "phone");
+CREATE INDEX IF NOT EXISTS "AIAudits_keyset_idx" ON "AIAudits" ("created_at", "email");
+CREATE INDEX IF NOT EXISTS "CalendarBookings_keyset_idx" ON "CalendarBookings" ("created_at", "email", "bookingTime");
+"""
+
+# Durable positions of outbound sync workers (e.g. the Google Sheets push)
+SYNC_CURSORS = """
+CREATE TABLE IF NOT EXISTS "SyncCursors" (
+    "name" TEXT PRIMARY KEY,
+    "last_created_at" TIMESTAMPTZ,
+    "last_id" BIGINT,
+    "rows_synced" BIGINT NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+# Idempotent ingest writes: the queue's per-job key (NULL for rows written before the queue)
+INGEST_KEYS = """
+ALTER TABLE "PreAuditIntakes" ADD COLUMN IF NOT EXISTS "ingest_key" TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS "PreAuditIntakes_ingest_key_key" ON "PreAuditIntakes" ("ingest_key");
+"""
+
+# "bookingTime" is TEXT (as sent by the frontend) and its ::timestamptz cast is not immutable, so it
+# cannot back an index. A trigger keeps a parsed copy that the reminder query and its index use.
+BOOKING_START_COLUMN = """
+ALTER TABLE "CalendarBookings" ADD COLUMN IF NOT EXISTS "booking_at" TIMESTAMPTZ;
+CREATE OR REPLACE FUNCTION "calendar_bookings_set_booking_at"() RETURNS TRIGGER AS $$
+BEGIN
+    BEGIN
+        NEW."booking_at" := NEW."bookingTime"::timestamptz;
+    EXCEPTION WHEN others THEN
+        NEW."booking_at" := NULL;
+    END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS "CalendarBookings_booking_at" ON "CalendarBookings";
+CREATE TRIGGER "CalendarBookings_booking_at" BEFORE INSERT OR UPDATE OF "bookingTime" ON "CalendarBookings"
+    FOR EACH ROW EXECUTE FUNCTION "calendar_bookings_set_booking_at"();
+UPDATE "CalendarBookings" SET "bookingTime" = "bookingTime" WHERE "booking_at" IS NULL;
+DROP INDEX IF EXISTS "CalendarBookings_pending_reminder_idx";
+CREATE INDEX IF NOT EXISTS "CalendarBookings_reminder_due_idx" ON "CalendarBookings" ("booking_at")
+    WHERE "reminder_sent_at" IS NULL;
+"""
+
+MIGRATIONS = [
+    (1, "base_schema_and_upsert_constraints", [BASE_TABLES, upsert_constraints, REPORTING_INDEXES]),
+    (2, "partition_conversation_memory_by_month", [PARTITIONED_CONVERSATIONS, migrate_legacy_conversations]),
+    (3, "conversation_activity_and_archive", [CONVERSATION_ARCHIVE]),
+    (4, "export_keyset_indexes", [EXPORT_KEYSET_INDEXES]),
+    (5, "sync_cursors", [SYNC_CURSORS]),
+    (6, "pre_audit_ingest_keys", [INGEST_KEYS]),
+    (7, "calendar_booking_start_column", [BOOKING_START_COLUMN]),
+]
+
+# Unique column sets the upserts in tony_backend rely on (ON CONFLICT targets)
+EXPECTED_UNIQUE = {
+    "ConversationIndex": [("messageID",)],
+    "ConversationMemory": [("messageID", "created_at")],
+    "ConversationArchive": [("messageID",)],
+    "PreAuditIntakes": [("id",), ("ingest_key",)],
+    "SyncCursors": [("name",)],
+    "Patients": [("phone",)],
+    "AIAudits": [("email",)],
+    "CalendarBookings": [("email", "bookingTime")],
+}
+EXPECTED_INDEXES = [
+    "Patients_created_at_brin", "AIAudits_created_at_brin", "CalendarBookings_created_at_brin",
+    "PreAuditIntakes_created_at_brin", "ConversationMemory_created_at_idx",
+    "ConversationMemory_updated_at_idx", "ConversationArchive_started_at_brin",
+    "PreAuditIntakes_keyset_idx", "Patients_keyset_idx", "AIAudits_keyset_idx", "CalendarBookings_keyset_idx",
+    "CalendarBookings_reminder_due_idx",
+]
+EXPECTED_PARTITIONED = ["ConversationMemory"]
+
+# --- RUNNER ---
+
+def _ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS "schema_migrations" (
+            "version" INTEGER PRIMARY KEY,
+            "name" TEXT NOT NULL,
+            "applied_at" TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """)
+
+def applied_versions(cur):
+    _ensure_migrations_table(cur)
+    cur.execute('SELECT "version" FROM "schema_migrations";')
+    return {row[0] for row in cur.fetchall()}
+
+def apply_migrations():
+    """
+    Applies pending migrations, each in its own transaction, under an advisory lock
+    so concurrent workers/replicas don't race. Returns the list of applied versions.
+    """
+    conn = db.get_connection(statement_timeout_ms=0)
+    if not conn:
+        log.error("migrations skipped: no database connection")
+        return []
+    applied_now = []
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(hashtext('schema_migrations'));")
+        conn.autocommit = False
+        try:
+            for version, name, steps in MIGRATIONS:
+                with conn:
+                    with conn.cursor() as cur:
+                        if version in applied_versions(cur):
+                            continue
+                        log.info("applying migration", extra={"version": version, "name": name})
+                        for step in steps:
+                            step(cur) if callable(step) else cur.execute(step)
+                        cur.execute('INSERT INTO "schema_migrations" ("version", "name") VALUES (%s, %s);', (version, name))
+                applied_now.append(version)
+        finally:
+            conn.rollback()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(hashtext('schema_migrations'));")
+    except Exception as e:
+        log.exception("migration failed", extra={"applied": applied_now})
+    finally:
+        conn.close()
+    return applied_now
+
+def ensure_conversation_partitions(months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Creates monthly ConversationMemory partitions up to months_ahead (scheduler job).
+    """
+    conn = db.get_connection(statement_timeout_ms=0)
+    if not conn:
+        return {"status": "error", "message": "No database connection"}
+    try:
+        created = []
+        today = datetime.date.today()
+        with conn:
+            with conn.cursor() as cur:
+                for offset in range(months_ahead + 1):
+                    month = month_start(today, offset)
+                    cur.execute("SELECT to_regclass(%s);", (f'"{partition_name(month)}"',))
+                    if cur.fetchone()[0] is None:
+                        create_month_partition(cur, month)
+                        created.append(partition_name(month))
+        return {"status": "success", "created": created}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        conn.close()
+
+def verify_schema():
+    """
+    Checks that the tables, unique constraints and indexes the code relies on exist.
+    Returns a list of human-readable problems (empty = schema OK).
+    """
+    conn = db.get_connection()
+    if not conn:
+        return ["No database connection"]
+    problems = []
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                latest = max(v for v, _, _ in MIGRATIONS)
+                missing_versions = sorted({v for v, _, _ in MIGRATIONS} - applied_versions(cur))
+                if missing_versions:
+                    problems.append(f"Pending migrations: {missing_versions} (latest is {latest})")
+                for table, column_sets in EXPECTED_UNIQUE.items():
+                    existing = unique_column_sets(cur, table)
+                    for cols in column_sets:
+                        if frozenset(cols) not in existing:
+                            problems.append(f'Missing UNIQUE on "{table}" ({", ".join(cols)})')
+                cur.execute("SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s);", (EXPECTED_INDEXES,))
+                found = {row[0] for row in cur.fetchall()}
+                problems += [f'Missing index "{name}"' for name in EXPECTED_INDEXES if name not in found]
+                for table in EXPECTED_PARTITIONED:
+                    cur.execute("SELECT relkind FROM pg_class WHERE relname = %s;", (table,))
+                    row = cur.fetchone()
+                    if not row or row[0] != "p":
+                        problems.append(f'"{table}" is not partitioned')
+    except Exception as e:
+        problems.append(f"Schema check failed: {e}")
+    finally:
+        conn.close()
+    return problems
+
+def run_startup_checks():
+    """
+    Startup hook: apply pending migrations (if enabled), ensure partitions, verify schema.
+    """
+    if SCHEMA_AUTO_MIGRATE:
+        apply_migrations()
+        ensure_conversation_partitions()
+    problems = verify_schema()
+    if problems:
+        log.warning("schema check found problems", extra={"problems": problems})
+    else:
+        log.info("schema verified")
+    return problems
+
+if __name__ == "__main__":
+    # Usage: python -m backend.migrations [apply|verify|partitions]
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "apply":
+        print("Applied:", apply_migrations())
+        print(ensure_conversation_partitions())
+    elif command == "partitions":
+        print(ensure_conversation_partitions())
+    problems = verify_schema()
+    print("\n".join(problems) if problems else "Schema OK")
+    sys.exit(1 if problems else 0)
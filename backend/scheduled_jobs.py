@@ -0,0 +1,111 @@
+import os
+import datetime
+
+try:
+    import backend.calendar_engine as calendar_engine
+    import backend.tony_backend as tony_backend
+    from backend.utils import email_validator
+    from backend.utils.email_engine import send_confirmation_email
+    from backend.utils.scheduler import AsyncScheduler, IntervalTrigger, CronTrigger
+    from backend import migrations
+    from backend.conversation_retention import run_retention
+    from backend.sheets_sync import sync_pre_audits, SHEETS_SYNC_INTERVAL
+except ImportError:
+    import calendar_engine
+    import tony_backend
+    from utils import email_validator
+    from utils.email_engine import send_confirmation_email
+    from utils.scheduler import AsyncScheduler, IntervalTrigger, CronTrigger
+    import migrations
+    from conversation_retention import run_retention
+    from sheets_sync import sync_pre_audits, SHEETS_SYNC_INTERVAL
+
+REMINDER_LEAD_HOURS = int(os.getenv("REMINDER_LEAD_HOURS", 24))
+# Bookings made this recently just got their confirmation email; no reminder on top of it
+REMINDER_SKIP_RECENT_MINUTES = int(os.getenv("REMINDER_SKIP_RECENT_MINUTES", 60))
+# Every worker runs the prewarm job; a cache refreshed by another worker this recently is left alone
+PREWARM_MIN_AGE = 45
+WEB_BASE_URL = os.getenv("WEB_BASE_URL", "https://web-production-a42d.up.railway.app").rstrip("/")
+
+# All jobs follow templates/scheduled_template.run_scheduled_task: return a status dict, never raise.
+
+def prewarm_availability():
+    """
+    Refreshes the Cal.com availability cache so /webhook/calendar-availability-check never waits on Cal.com.
+    """
+    try:
+        data = calendar_engine.get_calendar_availability(max_age=PREWARM_MIN_AGE)
+        slots = len(data[0]["bookings_summary"]) if data else 0
+        return {"status": "success", "bookings": slots}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+def refresh_dns_cache():
+    """
+    Re-resolves stale DNS verdicts used by /webhook/verify-email.
+    """
+    try:
+        return {"status": "success", **email_validator.refresh_dns_cache()}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+def send_booking_reminders():
+    """
+    Emails a reminder for every booking starting within REMINDER_LEAD_HOURS, except ones
+    created in the last REMINDER_SKIP_RECENT_MINUTES. Rows are claimed atomically via
+    reminder_sent_at, so each reminder goes out once.
+    """
+    try:
+        claimed = tony_backend.db.fetch_all("""
+            UPDATE "CalendarBookings" SET "reminder_sent_at" = NOW()
+            WHERE "reminder_sent_at" IS NULL
+              AND "booking_at" BETWEEN NOW() AND NOW() + make_interval(hours => %s)
+              AND COALESCE("created_at", '-infinity') < NOW() - make_interval(mins => %s)
+            RETURNING "email", "name", "bookingTime", "lang";
+        """, (REMINDER_LEAD_HOURS, REMINDER_SKIP_RECENT_MINUTES))
+
+        sent, failed = 0, 0
+        for row in claimed:
+            ok = send_confirmation_email(
+                row["email"], row.get("name") or "", "reminder", str(row["bookingTime"]),
+                WEB_BASE_URL, row.get("lang") or "sk"
+            )
+            if ok:
+                sent += 1
+                continue
+            failed += 1
+            # Release the claim so the next run retries this reminder
+            tony_backend.db.execute_query(
+                'UPDATE "CalendarBookings" SET "reminder_sent_at" = NULL WHERE "email" = %s AND "bookingTime" = %s;',
+                (row["email"], row["bookingTime"])
+            )
+        return {"status": "success" if not failed else "error", "sent": sent, "failed": failed,
+                "message": f"{failed} reminder(s) failed" if failed else None}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+def create_scheduler():
+    """
+    Builds the in-process scheduler with the standard jobs registered.
+    """
+    scheduler = AsyncScheduler(connection_factory=tony_backend.db.get_connection)
+    # No lock: the caches are shared per node, so the first worker due refreshes and the rest find it fresh
+    scheduler.add_job("prewarm_availability", prewarm_availability,
+                      IntervalTrigger(60, jitter=10, run_immediately=True), single_instance=False)
+    scheduler.add_job("refresh_dns_cache", refresh_dns_cache,
+                      IntervalTrigger(1800, jitter=120), single_instance=False)
+    scheduler.add_job("send_booking_reminders", send_booking_reminders,
+                      CronTrigger("*/15 * * * *", jitter=30))
+    scheduler.add_job("ensure_conversation_partitions", migrations.ensure_conversation_partitions,
+                      CronTrigger("30 3 * * *", jitter=300))
+    scheduler.add_job("conversation_retention", run_retention,
+                      CronTrigger("15 4 * * *", jitter=300))
+    # Single instance: the stored cursor must only be advanced by one worker at a time
+    scheduler.add_job("sheets_sync", sync_pre_audits,
+                      IntervalTrigger(SHEETS_SYNC_INTERVAL, jitter=10))
+    return scheduler
+
+if __name__ == "__main__":
+    # Local Test: run every job once
+    for job in (prewarm_availability, refresh_dns_cache, send_booking_reminders):
+        print(job.__name__, job(), datetime.datetime.now())
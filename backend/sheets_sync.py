@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import datetime
+from psycopg2.extras import RealDictCursor
+
+try:
+    from backend.tony_backend import db
+    from backend.utils.resilience import resilient_request, CircuitOpenError
+    from backend.utils.logger import get_logger
+except ImportError:
+    from tony_backend import db
+    from utils.resilience import resilient_request, CircuitOpenError
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Sheets Sync Config
+SHEETS_WEBHOOK_URL = os.getenv("SHEETS_WEBHOOK_URL")  # Apps Script web app (backend_scripts/google_apps_script.js)
+SHEETS_SYNC_INTERVAL = int(os.getenv("SHEETS_SYNC_INTERVAL", 120))
+SHEETS_SYNC_BATCH_SIZE = int(os.getenv("SHEETS_SYNC_BATCH_SIZE", 200))
+SHEETS_SYNC_MAX_BATCHES = 20  # bounds one run; the next run continues from the cursor
+# Rows younger than this are left for the next run: created_at is assigned at insert, so a slow
+# transaction can commit a row "behind" the cursor. The lag lets those rows land first.
+SHEETS_SYNC_SETTLE_SECONDS = 30
+CURSOR_NAME = "sheets:pre_audits"
+# Rows from before the batched sync were already posted one by one (without ids, so the Apps Script
+# cannot dedupe them). Without a stored cursor the sync starts at rows created after this process
+# started; SHEETS_SYNC_BACKFILL=true (or --backfill) pushes the whole table instead.
+SHEETS_SYNC_BACKFILL = os.getenv("SHEETS_SYNC_BACKFILL", "false").lower() == "true"
+PROCESS_STARTED_AT = datetime.datetime.now(datetime.timezone.utc)
+
+# Column order of the sheet (matches setup() in the Apps Script)
+SHEET_FIELDS = [
+    "name", "email", "business_name", "industry", "employees",
+    "what_sell", "typical_customer", "source",
+    "top_tasks", "magic_wand",
+    "leads_challenge",
+    "sales_team", "closing_issues",
+    "delivery_time", "ops_recurring",
+    "support_headaches",
+    "ai_experience", "which_ai_tools",
+    "success_definition", "specific_focus"
+]
+
+def load_cursor(cur):
+    cur.execute('SELECT "last_created_at", "last_id" FROM "SyncCursors" WHERE "name" = %s;', (CURSOR_NAME,))
+    row = cur.fetchone()
+    return (row["last_created_at"], row["last_id"]) if row and row["last_created_at"] else None
+
+def save_cursor(cur, position, count):
+    cur.execute("""
+        INSERT INTO "SyncCursors" ("name", "last_created_at", "last_id", "rows_synced", "updated_at")
+        VALUES (%s, %s, %s, %s, NOW())
+        ON CONFLICT ("name") DO UPDATE SET
+            "last_created_at" = EXCLUDED."last_created_at",
+            "last_id" = EXCLUDED."last_id",
+            "rows_synced" = "SyncCursors"."rows_synced" + EXCLUDED."rows_synced",
+            "updated_at" = NOW();
+    """, (CURSOR_NAME, position[0], position[1], count))
+
+def initial_cursor(cur, before=None):
+    """
+    Position of the newest intake created before `before` (default: process start), or None if there is none.
+    """
+    cur.execute("""
+        SELECT "created_at", "id" FROM "PreAuditIntakes"
+        WHERE "created_at" < %s
+        ORDER BY "created_at" DESC, "id" DESC LIMIT 1;
+    """, (before or PROCESS_STARTED_AT,))
+    row = cur.fetchone()
+    return (row["created_at"], row["id"]) if row else None
+
+def fetch_batch(cur, position, limit):
+    if position is None:
+        cur.execute("""
+            SELECT * FROM "PreAuditIntakes"
+            WHERE "created_at" < NOW() - make_interval(secs => %s)
+            ORDER BY "created_at", "id" LIMIT %s;
+        """, (SHEETS_SYNC_SETTLE_SECONDS, limit))
+    else:
+        cur.execute("""
+            SELECT * FROM "PreAuditIntakes"
+            WHERE ("created_at", "id") > (%s, %s)
+              AND "created_at" < NOW() - make_interval(secs => %s)
+            ORDER BY "created_at", "id" LIMIT %s;
+        """, (position[0], position[1], SHEETS_SYNC_SETTLE_SECONDS, limit))
+    return cur.fetchall()
+
+def to_sheet_row(row):
+    """
+    One intake -> the payload the Apps Script turns into a sheet row.
+    """
+    out = {"id": row["id"], "timestamp": row["created_at"].isoformat()}
+    for key in SHEET_FIELDS:
+        value = row.get(key)
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value)
+        out[key] = value if value is not None else ""
+    return out
+
+def push_batch(rows):
+    """
+    POSTs one multi-row payload. Returns (ok, message).
+    """
+    payload = {"batch_id": f"pre_audits:{rows[0]['id']}-{rows[-1]['id']}", "rows": [to_sheet_row(r) for r in rows]}
+    try:
+        response = resilient_request("POST", SHEETS_WEBHOOK_URL, "sheets.append", json=payload)
+    except CircuitOpenError as e:
+        return False, str(e)
+    except Exception as e:
+        return False, f"Sheets request failed: {e}"
+    if not response.ok:
+        return False, f"Sheets HTTP {response.status_code}"
+    try:
+        result = response.json()
+    except ValueError:
+        return False, "Sheets returned non-JSON response"
+    if result.get("result") != "success":
+        return False, f"Sheets error: {result.get('error')}"
+    return True, None
+
+def sync_pre_audits(backfill=SHEETS_SYNC_BACKFILL):
+    """
+    Scheduled job: pushes new PreAuditIntakes rows to the sheet in batches, resuming from
+    the cursor stored in "SyncCursors". The cursor only advances after the sheet acks a batch,
+    so delivery is at-least-once; the Apps Script drops row ids it has already written.
+    """
+    if not SHEETS_WEBHOOK_URL:
+        return {"status": "skipped", "message": "SHEETS_WEBHOOK_URL not set"}
+
+    started = time.monotonic()
+    conn = db.get_connection()
+    if not conn:
+        return {"status": "error", "message": "No database connection"}
+
+    synced, batches = 0, 0
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            position = load_cursor(cur)
+            if position is None and not backfill:
+                position = initial_cursor(cur)
+                if position is not None:
+                    save_cursor(cur, position, 0)
+                    log.info("sheets sync cursor initialized after existing rows",
+                             extra={"created_at": position[0].isoformat(), "id": position[1]})
+            conn.commit()
+            for _ in range(SHEETS_SYNC_MAX_BATCHES):
+                rows = fetch_batch(cur, position, SHEETS_SYNC_BATCH_SIZE)
+                conn.commit()
+                if not rows:
+                    break
+
+                ok, message = push_batch(rows)
+                if not ok:
+                    log.warning("sheets sync stopped", extra={"synced": synced, "batches": batches, "error": message})
+                    return {"status": "error", "message": message, "synced": synced, "batches": batches}
+
+                position = (rows[-1]["created_at"], rows[-1]["id"])
+                save_cursor(cur, position, len(rows))
+                conn.commit()
+                synced += len(rows)
+                batches += 1
+                if len(rows) < SHEETS_SYNC_BATCH_SIZE:
+                    break
+
+        if synced:
+            log.info("sheets sync finished", extra={"synced": synced, "batches": batches,
+                                                    "runtime_seconds": round(time.monotonic() - started, 3)})
+        return {"status": "success", "synced": synced, "batches": batches,
+                "runtime_seconds": round(time.monotonic() - started, 3)}
+    except Exception as e:
+        conn.rollback()
+        log.exception("sheets sync failed", extra={"synced": synced, "batches": batches})
+        return {"status": "error", "message": str(e), "synced": synced, "batches": batches}
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    # Usage: python -m backend.sheets_sync [--backfill]   (point SHEETS_WEBHOOK_URL at backend_scripts/sheets_standin.py to test locally)
+    # --backfill only matters while no cursor is stored; it pushes the whole table once
+    print(json.dumps(sync_pre_audits(backfill=SHEETS_SYNC_BACKFILL or "--backfill" in sys.argv), indent=2, default=str))
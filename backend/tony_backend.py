@@ -1,11 +1,30 @@
 import os
 import json
+import time
+import hashlib
 import datetime
+import threading
 import psycopg2
-from psycopg2.extras import Json
-from openai import OpenAI
+from collections import OrderedDict
+from psycopg2.extras import Json, RealDictCursor
+from openai import OpenAI, APIConnectionError, APIStatusError
 from dotenv import load_dotenv
 
+try:
+    from backend.utils.llm_hedging import chat_llm, LLMDeadlineExceeded
+    from backend.utils.intent_classifier import fast_path, detect_language
+    from backend.utils.tracing import span
+    from backend.utils.logger import get_logger
+    from backend.utils.shared_cache import get_shared_cache
+except ImportError:
+    from utils.llm_hedging import chat_llm, LLMDeadlineExceeded
+    from utils.intent_classifier import fast_path, detect_language
+    from utils.tracing import span
+    from utils.logger import get_logger
+    from utils.shared_cache import get_shared_cache
+
+log = get_logger(__name__)
+
 # Load environment variables from various possible locations
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Check local, parent, and grandparent for .env
@@ -30,6 +49,12 @@ def mask_key(k):
 
 # Configurations
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
+# What to answer when the chat turn deadline expires: "canned" (instant reply) or "model" (retry on LLM_FALLBACK_MODEL)
+LLM_FALLBACK_MODE = os.getenv("LLM_FALLBACK_MODE", "canned")
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "gpt-3.5-turbo")
+LLM_FALLBACK_TIMEOUT = float(os.getenv("LLM_FALLBACK_TIMEOUT", 5))  # reserved out of the turn deadline, not added to it
+LLM_FALLBACK_MIN_SECONDS = 1.0
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -38,6 +63,9 @@ DB_PORT = os.getenv("DB_PORT", "51580")
 DB_NAME = os.getenv("DB_NAME", "railway")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASS = os.getenv("DB_PASSWORD", "xqhcUQFWracYZcigUmiiUNBYRbUAaOEO")
+# Well below the ingest queue lease (120 s), so a slow write fails and retries instead of running twice
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
 
 print(f"🤖 Tony Initialization (Postgres Edition):")
 print(f"   OPENAI_KEY: {mask_key(OPENAI_API_KEY)}")
@@ -55,34 +83,97 @@ class DatabaseManager:
             "password": DB_PASS
         }
 
-    def get_connection(self):
+    def get_connection(self, statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS):
+        """
+        New connection with connect/statement timeouts (statement_timeout_ms=0 disables the latter,
+        for migrations and maintenance jobs). Returns None on failure.
+        """
+        timeouts = {"connect_timeout": DB_CONNECT_TIMEOUT, "options": f"-c statement_timeout={int(statement_timeout_ms)}"}
         try:
             if self.db_url:
-                return psycopg2.connect(self.db_url)
-            return psycopg2.connect(**self.conn_params)
+                return psycopg2.connect(self.db_url, **timeouts)
+            return psycopg2.connect(**self.conn_params, **timeouts)
         except Exception as e:
-            print(f"❌ Database Connection Error: {e}")
+            log.error("database connection failed", extra={"error": str(e)})
             return None
 
+    @staticmethod
+    def summarize(query):
+        # Short single-line statement label for trace spans
+        return " ".join(query.split())[:120]
+
     def execute_query(self, query, params=None):
-        conn = self.get_connection()
-        if not conn: return
-        try:
-            with conn:
-                with conn.cursor() as cur:
-                    cur.execute(query, params)
-        except Exception as e:
-            print(f"❌ Query Error: {e}")
-        finally:
-            conn.close()
+        """
+        Runs a single statement in its own transaction. Returns True on success.
+        """
+        with span("db.execute", kind="client", statement=self.summarize(query)) as sp:
+            conn = self.get_connection()
+            if not conn: return False
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        cur.execute(query, params)
+                return True
+            except Exception as e:
+                log.error("query failed", extra={"error": str(e), "statement": self.summarize(query)})
+                if sp: sp.error = str(e)
+                return False
+            finally:
+                conn.close()
+
+    def execute_many(self, statements):
+        """
+        Runs several (query, params) statements in one transaction on one connection.
+        Returns True if all of them committed.
+        """
+        with span("db.transaction", kind="client", statements=len(statements),
+                  statement=self.summarize(statements[0][0]) if statements else "") as sp:
+            conn = self.get_connection()
+            if not conn: return False
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        for query, params in statements:
+                            cur.execute(query, params)
+                return True
+            except Exception as e:
+                log.error("query failed", extra={"error": str(e), "statements": len(statements)})
+                if sp: sp.error = str(e)
+                return False
+            finally:
+                conn.close()
+
+    def fetch_all(self, query, params=None):
+        """
+        Runs a statement in its own transaction and returns all rows as dicts ([] on error).
+        """
+        with span("db.fetch", kind="client", statement=self.summarize(query)) as sp:
+            conn = self.get_connection()
+            if not conn: return []
+            try:
+                with conn:
+                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                        cur.execute(query, params)
+                        rows = [dict(r) for r in cur.fetchall()] if cur.description else []
+                if sp: sp.set(rows=len(rows))
+                return rows
+            except Exception as e:
+                log.error("query failed", extra={"error": str(e), "statement": self.summarize(query)})
+                if sp: sp.error = str(e)
+                return []
+            finally:
+                conn.close()
 
 db = DatabaseManager()
 
 # Initialize OpenAI
 openai_client: OpenAI = None
+chat_client: OpenAI = None
 if OPENAI_API_KEY:
     try:
         openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        # Chat turns run under their own deadline; SDK retries would outlive it and pin hedge threads
+        chat_client = openai_client.with_options(max_retries=0)
         print("   ✅ OpenAI: Connected")
     except Exception as e:
         print(f"   ❌ OpenAI Error: {e}")
@@ -94,6 +185,7 @@ KNOWLEDGE_PATH = os.path.join(os.path.dirname(__file__), "arcigy_knowledge.md")
 LOGICAL_PROMPT_PATH = os.path.join(os.path.dirname(__file__), "tony_prompt.md")
 DEV_PROMPT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "directives", "tony_prompt.md")
 PROMPT_PATH = LOGICAL_PROMPT_PATH if os.path.exists(LOGICAL_PROMPT_PATH) else DEV_PROMPT_PATH
+PROMPT_CACHE_TTL = 3600
 
 def load_knowledge_base():
     try:
@@ -104,7 +196,24 @@ def load_knowledge_base():
         print(f"Error loading knowledge base: {e}")
     return ""
 
+def _prompt_cache_key():
+    # File mtimes in the key: an edited prompt or knowledge base is picked up without waiting for the TTL
+    mtimes = [os.path.getmtime(p) if os.path.exists(p) else 0 for p in (PROMPT_PATH, KNOWLEDGE_PATH)]
+    return "tony:system_prompt:" + ":".join(f"{m:.0f}" for m in mtimes)
+
 def load_system_prompt():
+    """
+    System prompt + knowledge base, assembled once per node and shared by all workers.
+    """
+    key = _prompt_cache_key()
+    cached = get_shared_cache().get(key)
+    if cached is not None:
+        return cached
+    prompt = build_system_prompt()
+    get_shared_cache().set(key, prompt, ttl=PROMPT_CACHE_TTL)
+    return prompt
+
+def build_system_prompt():
     try:
         prompt_content = ""
         if os.path.exists(PROMPT_PATH):
@@ -122,21 +231,46 @@ def load_system_prompt():
 
 # --- PERSISTENCE FUNCTIONS (REWRITTEN FOR POSTGRES) ---
 
+# Last persisted lead fingerprint per conversation, so unchanged leads are not re-upserted every turn.
+# Per process: after a restart (or on another worker) the first write of a lead simply happens again.
+LEAD_HASH_CACHE_SIZE = 5000
+_lead_hashes = OrderedDict()
+_lead_lock = threading.Lock()
+persist_stats = {"conversation_writes": 0, "lead_writes": 0, "lead_writes_skipped": 0, "failures": 0}
+
+def lead_fingerprint(*fields):
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def get_persist_stats():
+    with _lead_lock:
+        return {**persist_stats, "tracked_conversations": len(_lead_hashes)}
+
 def persist_conversation(conversation_id, message, output, formatted_history):
     """
     Handles database updates for chat history and lead extraction.
+    Both writes share one transaction; the lead upsert is skipped when the lead is unchanged.
     """
     try:
         # 1. Update Memory
         full_conversation = formatted_history + f"\nUser: {message}\nBot: {output.get('response', '')}"
         
+        # ConversationMemory is partitioned by month; ConversationIndex pins each
+        # conversation to the partition of its first turn (see backend/migrations.py)
         query_memory = """
-            INSERT INTO "ConversationMemory" ("messageID", "conversation", "created_at")
-            VALUES (%s, %s, NOW())
-            ON CONFLICT ("messageID") 
-            DO UPDATE SET "conversation" = EXCLUDED."conversation";
+            WITH conv AS (
+                INSERT INTO "ConversationIndex" ("messageID", "created_at")
+                VALUES (%s, NOW())
+                ON CONFLICT ("messageID") DO UPDATE SET "messageID" = EXCLUDED."messageID"
+                RETURNING "created_at"
+            )
+            INSERT INTO "ConversationMemory" ("messageID", "conversation", "created_at", "updated_at")
+            SELECT %s, %s, conv."created_at", NOW() FROM conv
+            ON CONFLICT ("messageID", "created_at") 
+            DO UPDATE SET "conversation" = EXCLUDED."conversation", "updated_at" = NOW()
+            -- Transcripts only grow: a late write from an older turn must not overwrite a newer one
+            WHERE length(EXCLUDED."conversation") >= length("ConversationMemory"."conversation");
         """
-        db.execute_query(query_memory, (conversation_id, full_conversation))
+        statements = [(query_memory, (conversation_id, conversation_id, full_conversation))]
 
         # 2. Update Leads (Patients)
         ext = output.get("extractedData", {})
@@ -146,6 +280,7 @@ def persist_conversation(conversation_id, message, output, formatted_history):
         p_phone = output.get("phone")
 
         is_valid = all(x and x != "null" for x in [p_forname, p_surname, p_email, p_phone])
+        lead_hash = None
         
         if is_valid:
             # Prepare extra info for 'other_relevant_info' since we don't have company/turnover columns anymore
@@ -154,25 +289,49 @@ def persist_conversation(conversation_id, message, output, formatted_history):
                 extra_info["company"] = ext.get("company")
             if ext.get("turnover") and ext.get("turnover") != "null":
                 extra_info["turnover"] = ext.get("turnover")
-            
-            other_info_str = json.dumps(extra_info) if extra_info else None
-            
-            query_patient = """
-                INSERT INTO "Patients" ("forename", "surname", "email", "phone", "other_relevant_info", "created_at")
-                VALUES (%s, %s, %s, %s, %s, NOW())
-                ON CONFLICT ("phone") 
-                DO UPDATE SET 
-                    "email" = EXCLUDED."email",
-                    "other_relevant_info" = COALESCE(EXCLUDED."other_relevant_info", "Patients"."other_relevant_info");
-            """
-            db.execute_query(query_patient, (p_forname, p_surname, p_email, p_phone, other_info_str))
+
+            lead_hash = lead_fingerprint(p_forname, p_surname, p_email, p_phone, extra_info)
+            with _lead_lock:
+                unchanged = _lead_hashes.get(conversation_id) == lead_hash
+                if unchanged:
+                    _lead_hashes.move_to_end(conversation_id)
+                    persist_stats["lead_writes_skipped"] += 1
+
+            if unchanged:
+                lead_hash = None
+            else:
+                other_info_str = json.dumps(extra_info) if extra_info else None
+
+                query_patient = """
+                    INSERT INTO "Patients" ("forename", "surname", "email", "phone", "other_relevant_info", "created_at")
+                    VALUES (%s, %s, %s, %s, %s, NOW())
+                    ON CONFLICT ("phone") 
+                    DO UPDATE SET 
+                        "email" = EXCLUDED."email",
+                        "other_relevant_info" = COALESCE(EXCLUDED."other_relevant_info", "Patients"."other_relevant_info");
+                """
+                statements.append((query_patient, (p_forname, p_surname, p_email, p_phone, other_info_str)))
+
+        if not db.execute_many(statements):
+            with _lead_lock:
+                persist_stats["failures"] += 1
+            return
+
+        with _lead_lock:
+            persist_stats["conversation_writes"] += 1
+            if lead_hash:
+                persist_stats["lead_writes"] += 1
+                _lead_hashes[conversation_id] = lead_hash
+                _lead_hashes.move_to_end(conversation_id)
+                while len(_lead_hashes) > LEAD_HASH_CACHE_SIZE:
+                    _lead_hashes.popitem(last=False)
 
     except Exception as e:
-        print(f"Background Persistence Error: {e}")
+        log.exception("conversation persistence failed", extra={"conversation_id": conversation_id})
 
 def persist_audit(data: dict):
     """
-    Saves the full AI Business Audit data.
+    Saves the full AI Business Audit data. Returns True on success (ingest queue retries otherwise).
     """
     try:
         clean_data = {k: (v if v != "null" else None) for k, v in data.items()}
@@ -193,10 +352,13 @@ def persist_audit(data: dict):
                 "pitch" = EXCLUDED."pitch",
                 "problem" = EXCLUDED."problem";
         """
-        db.execute_query(query, clean_data)
-        print(f"✅ Audit successfully persisted for: {clean_data.get('email')}")
+        ok = db.execute_query(query, clean_data)
+        if ok:
+            log.info("audit persisted", extra={"email": clean_data.get("email")})
+        return ok
     except Exception as e:
-        print(f"❌ Postgres Audit Error: {e}")
+        log.exception("audit persistence failed")
+        return False
 
 def persist_booking(data: dict):
     """
@@ -213,14 +375,17 @@ def persist_booking(data: dict):
             )
             ON CONFLICT ("email", "bookingTime") DO NOTHING;
         """
-        db.execute_query(query, clean_data)
-        print(f"✅ Booking persisted for: {clean_data.get('email')}")
+        ok = db.execute_query(query, clean_data)
+        if ok:
+            log.info("booking persisted", extra={"email": clean_data.get("email")})
+        return ok
     except Exception as e:
-        print(f"❌ Postgres Booking Error: {e}")
+        log.exception("booking persistence failed")
+        return False
 
 def persist_pre_audit(data: dict):
     """
-    Saves the Pre-Audit Intake form.
+    Saves the Pre-Audit Intake form. Returns True on success (ingest queue retries otherwise).
     """
     try:
         clean_data = {k: (v if v != "" else None) for k, v in data.items()}
@@ -250,7 +415,9 @@ def persist_pre_audit(data: dict):
             'which_ai_tools': clean_data.get('which_ai_tools'),
             'success_definition': clean_data.get('success_definition'),
             'specific_focus': clean_data.get('specific_focus'),
-            'referrer': clean_data.get('referrer')
+            'referrer': clean_data.get('referrer'),
+            # Set by the ingest queue; a redelivered job hits the unique key instead of inserting twice
+            'ingest_key': clean_data.get('_ingest_key')
         }
 
         query = """
@@ -259,19 +426,94 @@ def persist_pre_audit(data: dict):
                 "typical_customer", "source", "top_tasks", "magic_wand", "leads_challenge", 
                 "sales_team", "closing_issues", "delivery_time", "ops_recurring", 
                 "support_headaches", "ai_experience", "which_ai_tools", "success_definition", 
-                "specific_focus", "referrer", "created_at"
+                "specific_focus", "referrer", "ingest_key", "created_at"
             ) VALUES (
                 %(name)s, %(email)s, %(business_name)s, %(industry)s, %(employees)s, %(what_sell)s,
                 %(typical_customer)s, %(source)s, %(top_tasks)s, %(magic_wand)s, %(leads_challenge)s,
                 %(sales_team)s, %(closing_issues)s, %(delivery_time)s, %(ops_recurring)s,
                 %(support_headaches)s, %(ai_experience)s, %(which_ai_tools)s, %(success_definition)s,
-                %(specific_focus)s, %(referrer)s, NOW()
-            );
+                %(specific_focus)s, %(referrer)s, %(ingest_key)s, NOW()
+            )
+            ON CONFLICT ("ingest_key") DO NOTHING;
         """
-        db.execute_query(query, params)
-        print(f"✅ Pre-Audit persisted for: {clean_data.get('email')}")
+        ok = db.execute_query(query, params)
+        if ok:
+            log.info("pre-audit persisted", extra={"email": clean_data.get("email")})
+        return ok
     except Exception as e:
-        print(f"❌ Postgres Pre-Audit Error: {e}")
+        log.exception("pre-audit persistence failed")
+        return False
+
+BOOKING_KEYWORDS = ['termin', 'termín', 'rezerv', 'diagnost', 'stretnut', 'stretnutie', 'book', 'call', 'meeting', 'appointment']
+
+def canned_fallback_response(message, lang):
+    """
+    Instant intent-specific reply used when the LLM misses the chat turn deadline.
+    """
+    wants_booking = any(word in message.lower() for word in BOOKING_KEYWORDS)
+    if lang == 'sk':
+        text = ("Rád ti rezervujem 15-minútovú Vstupnú Diagnostiku. Pošli mi prosím meno, email a telefón (s predvoľbou)."
+                if wants_booking else "Prepáč, chvíľku mi to trvá dlhšie než zvyčajne. Môžeš mi prosím správu zopakovať?")
+    else:
+        text = ("Happy to book your 15-minute Intro Diagnostic. Please send me your name, email and phone (with country code)."
+                if wants_booking else "Sorry, I'm a bit slower than usual right now. Could you please repeat your message?")
+    return {
+        "intention": "question",
+        "action": "null",
+        "forname": "null", "surname": "null", "email": "null", "phone": "null",
+        "extractedData": {},
+        "response": text,
+        "fallback": "canned"
+    }
+
+def is_transient_llm_error(error):
+    """
+    Timeouts, connection errors, 429 and 5xx; worth a hedge. Other 4xx would fail again.
+    """
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code == 429 or error.status_code >= 500)
+
+def complete_chat_turn(messages, message, lang):
+    """
+    Runs the chat completion under the per-turn deadline (with hedging).
+    Returns the raw JSON text, or a canned reply dict when the deadline is exceeded.
+    In "model" mode the fallback runs inside the same deadline: the primary gets the
+    deadline minus LLM_FALLBACK_TIMEOUT, the fallback whatever is left.
+    """
+    turn_started = time.monotonic()
+    primary_deadline = chat_llm.deadline
+    if LLM_FALLBACK_MODE == "model":
+        primary_deadline = max(chat_llm.deadline / 2, chat_llm.deadline - LLM_FALLBACK_TIMEOUT)
+    try:
+        with span("openai.chat", kind="client", model=CHAT_MODEL):
+            response = chat_llm.complete(
+                chat_client.chat.completions.create,
+                deadline=primary_deadline,
+                retryable=is_transient_llm_error,
+                model=CHAT_MODEL,
+                messages=messages,
+                response_format={"type": "json_object"}
+            )
+        return response.choices[0].message.content.strip()
+    except LLMDeadlineExceeded as e:
+        log.warning("chat turn deadline exceeded", extra={"error": str(e), "fallback_mode": LLM_FALLBACK_MODE})
+
+    remaining = chat_llm.deadline - (time.monotonic() - turn_started)
+    if LLM_FALLBACK_MODE == "model" and remaining >= LLM_FALLBACK_MIN_SECONDS:
+        try:
+            with span("openai.chat.fallback", kind="client", model=LLM_FALLBACK_MODEL):
+                response = chat_client.chat.completions.create(
+                    model=LLM_FALLBACK_MODEL,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    timeout=min(LLM_FALLBACK_TIMEOUT, remaining)
+                )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            log.error("fallback model failed", extra={"model": LLM_FALLBACK_MODEL, "error": str(e)})
+
+    return canned_fallback_response(message, lang)
 
 def get_tony_response(message, conversation_id, history, user_lang=None, user_data=None):
     """
@@ -283,7 +525,12 @@ def get_tony_response(message, conversation_id, history, user_lang=None, user_da
         if isinstance(history, list):
             formatted_history = "\n".join([f"{m.get('type', 'unknown').capitalize()}: {m.get('text', '')}" for m in history])
         
-        # 2. Get AI Response
+        # 2. Local fast-path: trivial turns (greetings, thanks, ...) are answered without OpenAI
+        local_output = fast_path.respond(message, user_lang, user_data, history=history)
+        if local_output:
+            return local_output, formatted_history
+
+        # 3. Get AI Response
         system_prompt = load_system_prompt()
         if not openai_client:
             raise Exception("OpenAI client not initialized. Check OPENAI_API_KEY variable.")
@@ -291,7 +538,7 @@ def get_tony_response(message, conversation_id, history, user_lang=None, user_da
         if "{now}" in system_prompt:
             system_prompt = system_prompt.replace("{now}", str(datetime.datetime.now()))
         
-        detected_lang = user_lang if user_lang else ('sk' if any(word in message.lower() for word in ['ahoj', 'chcem', 'termin', 'ano', 'dobry']) else 'en')
+        detected_lang = user_lang if user_lang else detect_language(message, default="en")[0]
         lang_instruction = f"IMPORTANT: Respond in {detected_lang.upper()} language." if detected_lang else ""
 
         user_ctx_str = ""
@@ -301,16 +548,14 @@ def get_tony_response(message, conversation_id, history, user_lang=None, user_da
             except:
                 pass
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt + f"\n\n{lang_instruction}\nIMPORTANT: Respond ONLY with a raw JSON object. No markdown blocks."},
-                {"role": "user", "content": f"{user_ctx_str}HISTÓRIA KONVERZÁCIE:\n{formatted_history}\n\nAKTUÁLNA SPRÁVA OD POUŽÍVATEĽA: {message}"}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        raw_text = response.choices[0].message.content.strip()
+        messages = [
+            {"role": "system", "content": system_prompt + f"\n\n{lang_instruction}\nIMPORTANT: Respond ONLY with a raw JSON object. No markdown blocks."},
+            {"role": "user", "content": f"{user_ctx_str}HISTÓRIA KONVERZÁCIE:\n{formatted_history}\n\nAKTUÁLNA SPRÁVA OD POUŽÍVATEĽA: {message}"}
+        ]
+        raw_text = complete_chat_turn(messages, message, detected_lang)
+        if isinstance(raw_text, dict):
+            raw_text['lang'] = detected_lang
+            return raw_text, formatted_history
         
         try:
             output = json.loads(raw_text)
@@ -322,15 +567,12 @@ def get_tony_response(message, conversation_id, history, user_lang=None, user_da
             else:
                 raise
         
-        lang = user_lang if user_lang else ('sk' if any(word in message.lower() for word in ['ahoj', 'chcem', 'termin', 'ano', 'dobry']) else 'en')
-        output['lang'] = lang
+        output['lang'] = detected_lang
         
         return output, formatted_history
 
     except Exception as e:
-        import traceback
-        print(f"Error in Tony AI: {e}")
-        traceback.print_exc()
+        log.exception("chat turn failed", extra={"conversation_id": conversation_id})
         return {
             "intention": "question",
             "response": "Prepáč, niečo sa pokazilo. Skús prosím znova.",
@@ -363,18 +605,19 @@ def generate_audit_confirmation(data: dict):
 
         user_prompt = f"User: {name}, Business: {business}, Industry: {industry}, Main Pain Point: {problem}. Generate the one-liner."
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=60
-        )
+        with span("openai.audit_confirmation", kind="client", model="gpt-4o-mini"):
+            response = openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=60
+            )
 
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"❌ Auto-Reply Generation Error: {e}")
+        log.exception("audit confirmation generation failed")
         return None
 
 if __name__ == "__main__":
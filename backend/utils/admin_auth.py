@@ -0,0 +1,44 @@
+import os
+import hmac
+import time
+import hashlib
+
+# Shared secret for /admin/* endpoints (exports, profiles). Unset = admin endpoints disabled.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+SIGNATURE_MAX_AGE = 300  # seconds a signed header stays valid
+
+def extract_token(headers):
+    auth = headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        return auth[7:].strip()
+    return headers.get("x-admin-token")
+
+def is_admin_request(headers):
+    """
+    True if the request carries the admin token (constant-time comparison).
+    """
+    token = extract_token(headers)
+    if not ADMIN_API_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_API_TOKEN.encode("utf-8"))
+
+def sign(message, timestamp=None):
+    """
+    Returns "<timestamp>.<hmac-sha256 hex>" over "<timestamp>:<message>" keyed with the admin token.
+    """
+    if not ADMIN_API_TOKEN:
+        raise RuntimeError("ADMIN_API_TOKEN is not set")
+    timestamp = int(timestamp if timestamp is not None else time.time())
+    digest = hmac.new(ADMIN_API_TOKEN.encode("utf-8"), f"{timestamp}:{message}".encode("utf-8"), hashlib.sha256)
+    return f"{timestamp}.{digest.hexdigest()}"
+
+def verify_signature(value, message, max_age=SIGNATURE_MAX_AGE):
+    """
+    Checks a value produced by sign() for the same message, rejecting stale timestamps.
+    """
+    if not ADMIN_API_TOKEN or not value or "." not in value:
+        return False
+    timestamp, _ = value.split(".", 1)
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > max_age:
+        return False
+    return hmac.compare_digest(value, sign(message, timestamp))
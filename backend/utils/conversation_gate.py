@@ -0,0 +1,125 @@
+import os
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+try:
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# "local" serializes within this worker; "postgres" adds an advisory lock for multi-worker deployments
+# (the default whenever WEB_CONCURRENCY runs more than one uvicorn worker)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+CHAT_GATE_BACKEND = os.getenv("CHAT_GATE_BACKEND", "postgres" if WEB_CONCURRENCY > 1 else "local")
+
+class LocalConversationGate:
+    """
+    Per-conversation serialization for chat turns.
+    - Turns for the same conversationID run one at a time, in arrival order (asyncio.Lock is FIFO).
+    - An identical message that is already in flight shares the running turn's result.
+    """
+    def __init__(self):
+        self._locks = {}      # conversation_id -> [lock, users]
+        self._in_flight = {}  # turn key -> Future
+        self.stats = {"turns": 0, "coalesced": 0, "serialized_waits": 0}
+
+    @staticmethod
+    def turn_key(conversation_id, message, history_len=0):
+        raw = f"{conversation_id}|{history_len}|{(message or '').strip()}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @asynccontextmanager
+    async def _serialize(self, conversation_id):
+        entry = self._locks.setdefault(conversation_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        if entry[0].locked():
+            self.stats["serialized_waits"] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._locks.pop(conversation_id, None)
+
+    async def run(self, conversation_id, message, produce, history_len=0):
+        """
+        Awaits produce() under the conversation's lock. Returns (result, shared),
+        where shared=True means the result came from an identical in-flight turn.
+        """
+        key = self.turn_key(conversation_id, message, history_len)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            async with self._serialize(conversation_id):
+                self.stats["turns"] += 1
+                result = await produce()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an un-awaited failure does not warn on garbage collection
+                future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def get_stats(self):
+        return {**self.stats, "backend": "local", "active_conversations": len(self._locks), "in_flight": len(self._in_flight)}
+
+class PostgresConversationGate(LocalConversationGate):
+    """
+    Same semantics as the local gate, plus a session advisory lock per conversation
+    so turns are also serialized across uvicorn workers.
+    """
+    def __init__(self, connection_factory):
+        super().__init__()
+        self.connection_factory = connection_factory
+
+    def _lock_conversation(self, conversation_id):
+        conn = self.connection_factory()
+        if not conn:
+            return None
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(hashtext(%s))", (f"chat:{conversation_id}",))
+        return conn
+
+    def _unlock_conversation(self, conn, conversation_id):
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(hashtext(%s))", (f"chat:{conversation_id}",))
+        finally:
+            conn.close()
+
+    @asynccontextmanager
+    async def _serialize(self, conversation_id):
+        async with super()._serialize(conversation_id):
+            conn = None
+            try:
+                conn = await asyncio.to_thread(self._lock_conversation, conversation_id)
+            except Exception as e:
+                log.warning("conversation advisory lock unavailable, serializing locally only",
+                            extra={"conversation_id": conversation_id, "error": str(e)})
+            try:
+                yield
+            finally:
+                if conn:
+                    await asyncio.to_thread(self._unlock_conversation, conn, conversation_id)
+
+    def get_stats(self):
+        return {**super().get_stats(), "backend": "postgres"}
+
+def create_gate(backend=CHAT_GATE_BACKEND, connection_factory=None):
+    if backend == "postgres" and connection_factory:
+        return PostgresConversationGate(connection_factory)
+    return LocalConversationGate()
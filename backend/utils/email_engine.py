@@ -2,11 +2,23 @@ import os
 import smtplib
 import json
 import time
-import requests # Added for Brevo API
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
+try:
+    from backend.utils.resilience import resilient_request, is_available
+    from backend.utils.tracing import span
+    from backend.utils.image_pipeline import image_pipeline
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.resilience import resilient_request, is_available
+    from utils.tracing import span
+    from utils.image_pipeline import image_pipeline
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -100,20 +112,22 @@ def send_confirmation_email(to_email, name, action_type, details, confirm_url, l
         
         # Translation logic
         if lang == 'sk':
-            subject = "Potvrdenie termínu | ArciGy"
+            subject = "Pripomienka termínu | ArciGy" if action_type == "reminder" else "Potvrdenie termínu | ArciGy"
             greeting = f"Dobrý deň, {name}!"
             description = {
                 "book": f"Váš nový termín na diagnostiku je: <b>{pretty_date}</b>.",
                 "cancel": f"Zrušenie termínu: <b>{pretty_date}</b>.",
-                "reschedule": f"Presun termínu: <b>{pretty_date}</b>."
+                "reschedule": f"Presun termínu: <b>{pretty_date}</b>.",
+                "reminder": f"Pripomíname Váš termín na diagnostiku: <b>{pretty_date}</b>."
             }.get(action_type, "")
         else:
-            subject = "Booking Confirmation | ArciGy"
+            subject = "Appointment Reminder | ArciGy" if action_type == "reminder" else "Booking Confirmation | ArciGy"
             greeting = f"Hello, {name}!"
             description = {
                 "book": f"Your appointment is set for: <b>{pretty_date}</b>.",
                 "cancel": f"Appointment cancelled: <b>{pretty_date}</b>.",
-                "reschedule": f"Appointment rescheduled: <b>{pretty_date}</b>."
+                "reschedule": f"Appointment rescheduled: <b>{pretty_date}</b>.",
+                "reminder": f"A reminder of your upcoming appointment: <b>{pretty_date}</b>."
             }.get(action_type, "")
 
         # Prepare HTML with Public Image URL (No attachments)
@@ -122,7 +136,8 @@ def send_confirmation_email(to_email, name, action_type, details, confirm_url, l
         # Safety: ensure no trailing slash for clean join, though we construct explicitly
         if base_url.endswith("/"): base_url = base_url[:-1]
         
-        image_url = f"{base_url}/assets/cyber_socials_layout.jpg"
+        # Right-sized, recompressed JPEG variant (falls back to the original asset)
+        image_url = image_pipeline.email_image_url(base_url, "cyber_socials_layout")
         
         # Replace the CID reference with the Real URL
         html_content = html_base.replace("cid:cyber_socials_layout", image_url)
@@ -130,9 +145,11 @@ def send_confirmation_email(to_email, name, action_type, details, confirm_url, l
         # Inject dynamic data
         html_content = html_content.replace("{greeting}", greeting).replace("{details}", description).replace("{confirm_url}", confirm_url).replace("{email_id}", str(int(time.time())))
 
-        # 1. ATTEMPT BREVO API (Primary)
-        if BREVO_API_KEY:
-            print(f"   🚀 Attempting to send via Brevo API (Asset URL: {image_url})...")
+        # 1. ATTEMPT BREVO API (Primary) - skipped while its circuit breaker is open
+        if BREVO_API_KEY and not is_available("brevo"):
+            log.warning("Brevo circuit open, routing to SMTP fallback")
+        elif BREVO_API_KEY:
+            log.debug("sending via Brevo", extra={"to": to_email, "image_url": image_url})
             try:
                 url = "https://api.brevo.com/v3/smtp/email"
                 headers = {
@@ -159,20 +176,20 @@ def send_confirmation_email(to_email, name, action_type, details, confirm_url, l
                 
                 # No attachments needed anymore!
 
-                response = requests.post(url, json=payload, headers=headers, timeout=10)
+                response = resilient_request("POST", url, "brevo.send", json=payload, headers=headers)
                 
                 if response.status_code in [200, 201, 202]:
-                    print(f"   ✅ Email sent successfully via Brevo API. Response: {response.json()}")
+                    log.info("email sent via Brevo", extra={"to": to_email, "message_id": response.json().get("messageId")})
                     return True
                 else:
-                    print(f"   ⚠️ Brevo API Error: {response.status_code} - {response.text}")
+                    log.warning("Brevo API error", extra={"status_code": response.status_code, "body": response.text[:500]})
                     # Continue to fallback
             except Exception as brevo_err:
-                print(f"   ❌ Brevo API Connection Failed: {brevo_err}")
+                log.warning("Brevo API request failed", extra={"error": str(brevo_err)})
                 # Continue to fallback
 
         # 2. FALLBACK TO HOSTINGER SMTP
-        print("   ⚠️ Trying Hostinger SMTP as fallback...")
+        log.info("trying Hostinger SMTP fallback", extra={"to": to_email})
         try:
             msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
@@ -181,18 +198,19 @@ def send_confirmation_email(to_email, name, action_type, details, confirm_url, l
             msg.attach(MIMEText(html_content, 'html'))
             
             if SMTP_USER and SMTP_PASS:
-                with smtplib.SMTP_SSL(SMTP_SERVER, 465, timeout=15) as server:
-                    server.login(SMTP_USER, SMTP_PASS)
-                    server.send_message(msg)
-                print("   ✅ Email sent successfully via Hostinger SMTP.")
+                with span("smtp.send", kind="client", server=SMTP_SERVER):
+                    with smtplib.SMTP_SSL(SMTP_SERVER, 465, timeout=15) as server:
+                        server.login(SMTP_USER, SMTP_PASS)
+                        server.send_message(msg)
+                log.info("email sent via SMTP", extra={"to": to_email})
                 return True
             else:
-                 print("   ❌ Hostinger SMTP Credentials missing.")
+                 log.error("Hostinger SMTP credentials missing")
                  return False
         except Exception as smtp_err:
-             print(f"   ❌ Hostinger SMTP Failed: {smtp_err}")
+             log.error("Hostinger SMTP failed", extra={"to": to_email, "error": str(smtp_err)})
              return False
 
     except Exception as e:
-        print(f"CRITICAL Email Error: {e}")
+        log.exception("confirmation email failed", extra={"to": to_email})
         return False
@@ -1,7 +1,19 @@
+import os
 import re
+import time
 import difflib
 import dns.resolver
 
+try:
+    from backend.utils.shared_cache import get_shared_cache
+except ImportError:
+    from utils.shared_cache import get_shared_cache
+
+# DNS verdict cache ("dns:<domain>" -> has_mail_host in the node-wide shared cache); refreshed off the request path by the scheduler
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", 6 * 3600))
+DNS_NEGATIVE_TTL = int(os.getenv("DNS_NEGATIVE_TTL", 600))
+DNS_KEY_PREFIX = "dns:"
+
 # Common email domains for typo suggestion
 COMMON_DOMAINS = [
     "gmail.com", "googlemail.com", "yahoo.com", "yahoo.co.uk", "hotmail.com", 
@@ -10,6 +22,54 @@ COMMON_DOMAINS = [
     "azet.sk", "zoznam.sk", "centrum.sk", "post.sk", "pobox.sk", "atlas.sk", "gmail.sk"
 ]
 
+def resolve_mail_domain(domain):
+    """
+    Uncached DNS check: True if the domain has MX records (or at least an A record).
+    """
+    try:
+        # We only check likely external domains. localhost/internal skipped if any.
+        records = dns.resolver.resolve(domain, 'MX')
+        if not records:
+             raise Exception("No MX records")
+        return True
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers, Exception) as e:
+        # Fallback: try A record (some domains handle mail on A record, though rare for major ones)
+        try:
+             dns.resolver.resolve(domain, 'A')
+             return True
+        except:
+             return False
+
+def domain_accepts_mail(domain):
+    """
+    Cached DNS verdict for a domain (positive and negative answers have separate TTLs).
+    """
+    cached = get_shared_cache().get(DNS_KEY_PREFIX + domain)
+    if cached is not None:
+        return cached
+
+    verdict = resolve_mail_domain(domain)
+    get_shared_cache().set(DNS_KEY_PREFIX + domain, verdict, ttl=DNS_CACHE_TTL if verdict else DNS_NEGATIVE_TTL)
+    return verdict
+
+def refresh_dns_cache(max_age_ratio=0.5):
+    """
+    Re-resolves cached domains older than max_age_ratio of their TTL. Returns stats.
+    Entries another worker already refreshed are young again and get skipped.
+    """
+    cache = get_shared_cache()
+    entries = cache.items(DNS_KEY_PREFIX)
+    now = time.time()
+    refreshed, changed = 0, 0
+    for key, verdict, stored_at, expires_at in entries:
+        if now - stored_at < (expires_at - stored_at) * max_age_ratio:
+            continue
+        new_verdict = resolve_mail_domain(key[len(DNS_KEY_PREFIX):])
+        cache.set(key, new_verdict, ttl=DNS_CACHE_TTL if new_verdict else DNS_NEGATIVE_TTL)
+        refreshed += 1
+        changed += int(new_verdict != verdict)
+    return {"cached": len(entries), "refreshed": refreshed, "changed": changed}
+
 def validate_email_deep(email: str, lang: str = "sk"):
     """
     Validates email format, checks for typos, and verifies MX records.
@@ -45,18 +105,9 @@ def validate_email_deep(email: str, lang: str = "sk"):
             msg = "Did you mean...?" if lang != "sk" else "Mysleli ste...?"
             return False, msg, suggestion
 
-    # 5. MX Record Check (DNS)
-    try:
-        # We only check likely external domains. localhost/internal skipped if any.
-        records = dns.resolver.resolve(domain, 'MX')
-        if not records:
-             raise Exception("No MX records")
-    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers, Exception) as e:
-        # Fallback: try A record (some domains handle mail on A record, though rare for major ones)
-        try:
-             dns.resolver.resolve(domain, 'A')
-        except:
-             msg = "Domain does not exist." if lang != "sk" else "Doména neexistuje."
-             return False, msg, None
+    # 5. MX Record Check (DNS, cached)
+    if not domain_accepts_mail(domain):
+        msg = "Domain does not exist." if lang != "sk" else "Doména neexistuje."
+        return False, msg, None
 
     return True, "Valid", None
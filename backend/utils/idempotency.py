@@ -0,0 +1,187 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    from backend.utils.shared_cache import get_shared_cache
+except ImportError:
+    from utils.shared_cache import get_shared_cache
+
+# Idempotency Config
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 600))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 2048))
+# How long a worker's pending claim blocks the same key elsewhere; must outlast the call itself
+IDEMPOTENCY_CLAIM_SECONDS = int(os.getenv("IDEMPOTENCY_CLAIM_SECONDS", 90))
+IDEMPOTENCY_POLL_SECONDS = float(os.getenv("IDEMPOTENCY_POLL_SECONDS", 0.2))
+PENDING_MARKER = "__idempotency_pending__"
+
+def derive_key(*parts):
+    """
+    Builds a stable idempotency key from request fields (e.g. email, bookingTime, conversationID).
+    """
+    normalized = [str(p).strip().lower() if p is not None else "" for p in parts]
+    return hashlib.sha256("|".join(normalized).encode("utf-8")).hexdigest()
+
+class IdempotencyPendingError(RuntimeError):
+    pass
+
+class IdempotencyKeyMismatch(ValueError):
+    pass
+
+def _is_pending(value):
+    return isinstance(value, dict) and PENDING_MARKER in value
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class IdempotencyStore:
+    """
+    Coalesces concurrent identical calls onto one execution and replays recent results.
+    Thread-safe, so it works for sync handlers running in the threadpool.
+    With a namespace, the node's shared cache holds a pending claim while a call runs and then
+    its result (a JSON value), so identical calls on other workers wait for it or replay it.
+    """
+    def __init__(self, ttl_seconds=IDEMPOTENCY_TTL_SECONDS, max_entries=IDEMPOTENCY_MAX_ENTRIES, namespace=None,
+                 claim_seconds=IDEMPOTENCY_CLAIM_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.claim_seconds = claim_seconds
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # key -> (expires_at, result)
+        self._in_flight = {}
+        self.stats = {"executed": 0, "coalesced": 0, "replayed": 0, "shared_replayed": 0, "shared_waited": 0}
+
+    def _shared_key(self, key):
+        return f"idem:{self.namespace}:{key}"
+
+    def scoped_key(self, client_key, *payload):
+        """
+        Store key for a client-supplied Idempotency-Key, bound to the payload fields so a
+        reused or guessed key never replays someone else's result. Raises IdempotencyKeyMismatch
+        if the client key was already used with different fields within the TTL.
+        """
+        fingerprint = derive_key(*payload)
+        if self.namespace:
+            cache, binding = get_shared_cache(), f"idem:{self.namespace}:client:{derive_key(client_key)}"
+            if cache.add(binding, fingerprint, ttl=self.ttl_seconds) is False and cache.get(binding) not in (None, fingerprint):
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request")
+        return derive_key(client_key, fingerprint)
+
+    def _get_cached(self, key, now):
+        entry = self._results.get(key)
+        if not entry:
+            return None
+        expires_at, result = entry
+        if expires_at < now:
+            del self._results[key]
+            return None
+        return result
+
+    def _get_shared(self, key):
+        if not self.namespace:
+            return None
+        value = get_shared_cache().get(self._shared_key(key))
+        return None if _is_pending(value) else value
+
+    def _claim_or_wait(self, key):
+        """
+        Claims key across workers. Returns (True, None) if this process should execute,
+        or (False, result) once another worker's call has completed.
+        """
+        cache, shared_key = get_shared_cache(), self._shared_key(key)
+        deadline = time.monotonic() + self.claim_seconds + 5
+        while True:
+            claimed = cache.add(shared_key, {PENDING_MARKER: os.getpid()}, ttl=self.claim_seconds)
+            if claimed is not False:  # None: the cache is failing, fall back to per-process behaviour
+                return True, None
+            value = cache.get(shared_key)
+            if value is not None and not _is_pending(value):
+                return False, value
+            if time.monotonic() >= deadline:
+                raise IdempotencyPendingError("an identical request is still being processed")
+            time.sleep(IDEMPOTENCY_POLL_SECONDS)
+
+    def _store(self, key, result, now):
+        self._results[key] = (now + self.ttl_seconds, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def run(self, key, fn, *args, should_cache=None, **kwargs):
+        """
+        Executes fn(*args, **kwargs) at most once per key within the TTL.
+        Returns (result, replayed) where replayed is True if this caller did not trigger the call.
+        should_cache(result) decides whether a result is kept for later replays (default: always).
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._get_cached(key, now)
+            if cached is not None:
+                self.stats["replayed"] += 1
+                return cached, True
+
+        # Outside the lock: a SQLite read must not serialize unrelated keys.
+        shared = self._get_shared(key)
+        if shared is not None:
+            with self._lock:
+                self.stats["replayed"] += 1
+                self.stats["shared_replayed"] += 1
+            return shared, True
+
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = _InFlight()
+                self._in_flight[key] = pending
+                is_leader = True
+            else:
+                self.stats["coalesced"] += 1
+                is_leader = False
+
+        if not is_leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.result, True
+
+        executed = False
+        try:
+            if self.namespace:
+                executed, shared = self._claim_or_wait(key)
+                if not executed:
+                    with self._lock:
+                        self.stats["replayed"] += 1
+                        self.stats["shared_waited"] += 1
+                    pending.result = shared
+                    return shared, True
+            executed = True
+            pending.result = fn(*args, **kwargs)
+            return pending.result, False
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            keep = pending.error is None and (should_cache is None or should_cache(pending.result))
+            if executed and self.namespace:
+                if keep:
+                    get_shared_cache().set(self._shared_key(key), pending.result, ttl=self.ttl_seconds)
+                else:
+                    get_shared_cache().delete(self._shared_key(key))  # release the claim so a retry can run
+            with self._lock:
+                self.stats["executed"] += int(executed)
+                self._in_flight.pop(key, None)
+                if keep:
+                    self._store(key, pending.result, time.monotonic())
+            pending.event.set()
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "cached": len(self._results), "in_flight": len(self._in_flight)}
+
+booking_idempotency = IdempotencyStore(namespace="booking")
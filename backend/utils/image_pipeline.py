@@ -0,0 +1,233 @@
+import os
+import re
+import io
+import sys
+import json
+import hashlib
+import threading
+
+try:
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# fcntl is POSIX-only; without it concurrent builds just duplicate work
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Pillow is optional: without it (or before the first build) the originals in assets/ are served
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+# Image Pipeline Config
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(ROOT_DIR, "data", "img"))
+IMAGE_WIDTHS = (480, 960, 1400, 1920)
+EMAIL_IMAGE_WIDTH = 1400  # premium_email.html renders the hero at 700px; 2x for retina
+QUALITY = {"avif": 50, "webp": 78, "jpeg": 80}
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+VARIANT_RE = re.compile(r"^([A-Za-z0-9_-]+)\.(\d+)\.[0-9a-f]{12}\.(avif|webp|jpg|png)$")
+
+def available_formats():
+    """
+    Modern formats this Pillow build can encode, best first.
+    """
+    if Image is None:
+        return []
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+
+def _sha(data, length=12):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _encode(img, fmt):
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        img.convert("RGB").save(buffer, "JPEG", quality=QUALITY["jpeg"], optimize=True, progressive=True)
+    elif fmt == "png":
+        img.save(buffer, "PNG", optimize=True)
+    else:
+        img.save(buffer, fmt.upper(), quality=QUALITY[fmt])
+    return buffer.getvalue()
+
+class ImagePipeline:
+    """
+    Builds resized AVIF/WebP/JPEG variants of assets/ with content-hashed names and
+    a manifest.json, and resolves the best variant for an Accept header and width.
+    """
+    def __init__(self, source_dir=ASSETS_DIR, output_dir=IMAGE_CACHE_DIR, widths=IMAGE_WIDTHS):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.widths = widths
+        self.manifest_path = os.path.join(output_dir, "manifest.json")
+        self.manifest = {}
+        self._lock = threading.Lock()
+        self.load_manifest()
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def _fresh(self, entry, source_hash):
+        if not entry or entry.get("source_hash") != source_hash:
+            return False
+        return all(os.path.exists(os.path.join(self.output_dir, name))
+                   for sizes in entry["variants"].values() for name in sizes.values())
+
+    def build_one(self, path, source_hash):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        with Image.open(path) as src:
+            src.load()
+            has_alpha = src.mode in ("RGBA", "LA") or (src.mode == "P" and "transparency" in src.info)
+            img = src.convert("RGBA" if has_alpha else "RGB")
+        # JPEG has no alpha channel; transparent sources keep a PNG fallback instead
+        formats = available_formats() + ["png" if has_alpha else "jpeg"]
+        widths = sorted({w for w in self.widths if w < img.width} | {img.width})
+
+        variants = {fmt: {} for fmt in formats}
+        for width in widths:
+            resized = img if width == img.width else img.resize(
+                (width, round(img.height * width / img.width)), Image.LANCZOS)
+            for fmt in formats:
+                data = _encode(resized, fmt)
+                ext = "jpg" if fmt == "jpeg" else fmt
+                name = f"{stem}.{width}.{_sha(data)}.{ext}"
+                target = os.path.join(self.output_dir, name)
+                if not os.path.exists(target):
+                    _write_atomic(target, data)
+                variants[fmt][str(width)] = name
+        return {
+            "source": os.path.relpath(path, ROOT_DIR), "source_hash": source_hash,
+            "width": img.width, "height": img.height, "fallback": formats[-1], "variants": variants
+        }
+
+    def build(self, force=False):
+        """
+        Generates missing/stale variants. Workers on one node serialize on a lock file:
+        the first one encodes, the others wait, reload its manifest and find it fresh.
+        Returns a summary dict.
+        """
+        if Image is None:
+            return {"status": "skipped", "message": "Pillow not installed; serving originals"}
+        if not os.path.isdir(self.source_dir):
+            return {"status": "skipped", "message": f"No assets dir at {self.source_dir}"}
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, ".build.lock"), "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return self._build_locked(force)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _build_locked(self, force):
+        self.load_manifest()  # another worker may have built while we waited for the lock
+        manifest, built = {}, []
+        for filename in sorted(os.listdir(self.source_dir)):
+            if not filename.lower().endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(self.source_dir, filename)
+            stem = os.path.splitext(filename)[0]
+            with open(path, "rb") as f:
+                source_hash = _sha(f.read())
+            if not force and self._fresh(self.manifest.get(stem), source_hash):
+                manifest[stem] = self.manifest[stem]
+                continue
+            try:
+                manifest[stem] = self.build_one(path, source_hash)
+                built.append(stem)
+            except Exception as e:
+                log.warning("image pipeline could not process image", extra={"file": filename, "error": str(e)})
+
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+        with self._lock:
+            self.manifest = manifest
+        self._prune(manifest)
+        if built:
+            log.info("image pipeline built images", extra={"built": built, "images": len(manifest)})
+        return {"status": "success", "built": built, "images": len(manifest), "formats": available_formats()}
+
+    def _prune(self, manifest):
+        keep = {name for entry in manifest.values() for sizes in entry["variants"].values() for name in sizes.values()}
+        for filename in os.listdir(self.output_dir):
+            if VARIANT_RE.match(filename) and filename not in keep:
+                os.remove(os.path.join(self.output_dir, filename))
+
+    def resolve(self, stem, width=None, accept="", fmt=None):
+        """
+        Returns (variant filename, mime type) for the best format the client accepts
+        and the smallest width >= the requested one, or None if the image is unknown.
+        """
+        with self._lock:
+            entry = self.manifest.get(stem)
+        if not entry:
+            return None
+        if fmt is None:
+            fmt = next((f for f in ("avif", "webp") if f in entry["variants"] and MIME_TYPES[f] in accept),
+                       entry["fallback"])
+        sizes = entry["variants"].get(fmt) or entry["variants"][entry["fallback"]]
+        widths = sorted(int(w) for w in sizes)
+        chosen = next((w for w in widths if width and w >= width), widths[-1])
+        name = sizes[str(chosen)]
+        return name, MIME_TYPES["jpeg" if name.endswith(".jpg") else name.rsplit(".", 1)[1]]
+
+    def variant_path(self, filename):
+        """
+        Absolute path of a generated variant, or None (names are validated, no traversal).
+        """
+        if not VARIANT_RE.match(filename or ""):
+            return None
+        path = os.path.join(self.output_dir, filename)
+        return path if os.path.exists(path) else None
+
+    def parse_variant_name(self, filename):
+        """
+        (stem, width) of a variant file name, also for variants that no longer exist
+        (pruned after a re-encode, or a fresh deploy), or None.
+        """
+        match = VARIANT_RE.match(filename or "")
+        return (match.group(1), int(match.group(2))) if match else None
+
+    def original_path(self, stem):
+        for ext in SOURCE_EXTENSIONS:
+            path = os.path.join(self.source_dir, stem + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def email_image_url(self, base_url, stem, width=EMAIL_IMAGE_WIDTH):
+        """
+        URL for <img> in emails: a JPEG/PNG variant (mail clients lack WebP/AVIF support)
+        at the rendered size, falling back to the original asset.
+        """
+        resolved = self.resolve(stem, width, accept="")
+        if resolved:
+            return f"{base_url}/img/v/{resolved[0]}"
+        original = self.original_path(stem)
+        return f"{base_url}/assets/{os.path.basename(original) if original else stem + '.jpg'}"
+
+image_pipeline = ImagePipeline()
+
+if __name__ == "__main__":
+    # Usage: python -m backend.utils.image_pipeline [--force]
+    print(json.dumps(image_pipeline.build(force="--force" in sys.argv), indent=2))
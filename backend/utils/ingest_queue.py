@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+try:
+    from backend.utils import tracing
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils import tracing
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Ingest Queue Config
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INGEST_QUEUE_PATH = os.getenv("INGEST_QUEUE_PATH", os.path.join(ROOT_DIR, "data", "ingest_queue.sqlite"))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", 8))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 1))
+INGEST_BATCH_SIZE = 20
+INGEST_LEASE_SECONDS = 120  # per job: renewed before each handler runs, so keep one job's DB/HTTP timeouts below it
+INGEST_MAX_BACKOFF = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    trace_parent TEXT
+);
+CREATE INDEX IF NOT EXISTS ingest_ready_idx ON ingest (status, next_attempt_at);
+"""
+
+class IngestQueue:
+    """
+    Durable local queue for webhook submissions.
+    Payloads are appended to a SQLite write-ahead log and acked immediately;
+    worker threads drain them into Postgres with retries and dead-lettering.
+    """
+    def __init__(self, path=INGEST_QUEUE_PATH, max_attempts=INGEST_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.handlers = {}
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        # Queue files created before trace propagation lack the column
+        if "trace_parent" not in {row[1] for row in conn.execute("PRAGMA table_info(ingest)")}:
+            conn.execute("ALTER TABLE ingest ADD COLUMN trace_parent TEXT")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def register(self, kind, handler):
+        """
+        handler(payload: dict) must return a truthy value on success; falsy or raising means retry.
+        Delivery is at-least-once (lease expiry, a failed ack), so handlers must be idempotent:
+        payload["_ingest_key"] is a unique id per enqueued job to deduplicate on.
+        """
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, payload):
+        now = time.time()
+        payload = {**payload, "_ingest_key": uuid.uuid4().hex}
+        cur = self._conn().execute(
+            "INSERT INTO ingest (kind, payload, next_attempt_at, created_at, trace_parent) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload, ensure_ascii=False, default=str), now, now, tracing.traceparent())
+        )
+        self._wakeup.set()
+        return cur.lastrowid
+
+    def claim(self, limit=INGEST_BATCH_SIZE):
+        """
+        Leases up to limit ready rows. Returns (rows, lease) where lease is the locked_until
+        value written, which renew() uses to prove the rows are still ours.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """SELECT id, kind, payload, attempts, trace_parent FROM ingest
+                   WHERE (status = 'pending' AND next_attempt_at <= ?)
+                      OR (status = 'inflight' AND locked_until < ?)
+                   ORDER BY id LIMIT ?""",
+                (now, now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE ingest SET status = 'inflight', locked_until = ? WHERE id = ?",
+                    [(now + INGEST_LEASE_SECONDS, r[0]) for r in rows]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return rows, now + INGEST_LEASE_SECONDS
+
+    def renew(self, job_id, lease):
+        """
+        Extends one job's lease if it is still ours. Returns the new lease, or None if the
+        old one expired and another worker has re-claimed the row.
+        """
+        new_lease = time.time() + INGEST_LEASE_SECONDS
+        cur = self._conn().execute(
+            "UPDATE ingest SET locked_until = ? WHERE id = ? AND status = 'inflight' AND locked_until = ?",
+            (new_lease, job_id, lease)
+        )
+        return new_lease if cur.rowcount == 1 else None
+
+    def _complete(self, job_id):
+        self._conn().execute("DELETE FROM ingest WHERE id = ?", (job_id,))
+
+    def _fail(self, job_id, kind, attempts, error):
+        attempts += 1
+        if attempts >= self.max_attempts:
+            log.error("ingest job dead-lettered", extra={"job_id": job_id, "kind": kind, "attempts": attempts, "error": str(error)})
+            self._conn().execute(
+                "UPDATE ingest SET status = 'dead', attempts = ?, last_error = ?, locked_until = NULL WHERE id = ?",
+                (attempts, str(error)[:1000], job_id)
+            )
+            return
+        delay = min(INGEST_MAX_BACKOFF, 2 ** attempts)
+        self._conn().execute(
+            "UPDATE ingest SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ?, locked_until = NULL WHERE id = ?",
+            (attempts, str(error)[:1000], time.time() + delay, job_id)
+        )
+
+    def process_batch(self, limit=INGEST_BATCH_SIZE):
+        """
+        Claims and processes one batch. Returns the number of jobs claimed.
+        """
+        rows, lease = self.claim(limit)
+        for job_id, kind, payload, attempts, trace_parent in rows:
+            # Jobs run one after another; each gets a fresh lease so later rows in the batch
+            # cannot expire (and be re-claimed by another worker) while earlier ones run
+            if self.renew(job_id, lease) is None:
+                log.warning("ingest lease lost, skipping job", extra={"job_id": job_id, "kind": kind})
+                continue
+            handler = self.handlers.get(kind)
+            if handler is None:
+                self._fail(job_id, kind, attempts, f"No handler registered for '{kind}'")
+                continue
+            # Continues the trace of the request that enqueued the job
+            with tracing.start_trace(f"ingest {kind}", parent=trace_parent, kind="consumer",
+                                     job_id=job_id, attempt=attempts + 1) as sp:
+                try:
+                    ok = handler(json.loads(payload))
+                    error = None if ok else "Handler reported failure"
+                except Exception as e:
+                    error = e
+                if sp and error is not None:
+                    sp.error = str(error)
+            if error is None:
+                self._complete(job_id)
+            else:
+                self._fail(job_id, kind, attempts, error)
+        return len(rows)
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.process_batch():
+                    continue
+            except Exception as e:
+                log.exception("ingest worker error")
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+
+    def start(self, workers=INGEST_WORKERS):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(workers):
+            t = threading.Thread(target=self._worker_loop, name=f"ingest-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        log.info("ingest queue started", extra={"workers": workers, "path": self.path})
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    def requeue_dead(self, kind=None):
+        query = "UPDATE ingest SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'"
+        params = [time.time()]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        cur = self._conn().execute(query, params)
+        self._wakeup.set()
+        return cur.rowcount
+
+    def get_stats(self):
+        rows = self._conn().execute("SELECT kind, status, COUNT(*) FROM ingest GROUP BY kind, status").fetchall()
+        stats = {}
+        for kind, status, count in rows:
+            stats.setdefault(kind, {})[status] = count
+        return {"path": self.path, "workers": len(self._threads), "jobs": stats}
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+def get_default_queue():
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = IngestQueue()
+        return _default_queue
@@ -0,0 +1,184 @@
+import os
+import re
+import threading
+import unicodedata
+
+# Local fast-path Config
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", 0.75))
+INTENT_MAX_WORDS = int(os.getenv("INTENT_MAX_WORDS", 8))  # longer messages always go to the LLM
+LOCAL_INTENTS_ENABLED = os.getenv("LOCAL_INTENTS_ENABLED", "true").lower() != "false"
+
+# Lexicons are matched without diacritics ("ďakujem" -> "dakujem")
+SK_MARKERS = {
+    "ahoj", "cau", "dobry", "den", "dakujem", "dakujeme", "vdaka", "chcem", "termin", "ano", "nie",
+    "prosim", "som", "sa", "je", "mate", "kedy", "ste", "mozem", "by", "si", "na", "zdravim", "hodiny"
+}
+EN_MARKERS = {
+    "hello", "hi", "hey", "thanks", "thank", "you", "want", "book", "call", "please", "yes", "no",
+    "the", "is", "are", "when", "can", "i", "would", "like", "a", "meeting", "hours", "good", "morning"
+}
+SK_DIACRITICS = set("áäčďéíĺľňóôŕšťúýž")
+
+INTENT_LEXICONS = {
+    "greeting": {
+        "core": {"ahoj", "cau", "caute", "zdravim", "nazdar", "servus", "dobry", "den", "dobre", "rano", "vecer",
+                 "hello", "hi", "hey", "morning", "afternoon", "evening", "good"},
+        "filler": {"tony", "there", "vsetci", "vsetkym"},
+    },
+    "thanks": {
+        "core": {"dakujem", "dakujeme", "dakujes", "vdaka", "dik", "diky", "thanks", "thank", "thx"},
+        "filler": {"vam", "ti", "you", "very", "much", "moc", "pekne", "velmi", "so", "a", "lot", "super", "ok", "okay"},
+    },
+    "booking": {
+        "core": {"termin", "rezervovat", "rezervacia", "rezervaciu", "diagnostika", "diagnostiku", "stretnutie",
+                 "hovor", "book", "booking", "call", "meeting", "appointment", "schedule"},
+        "filler": {"chcem", "chcel", "chcela", "by", "som", "si", "sa", "na", "mozem", "prosim", "jeden", "nejaky",
+                   "i", "want", "to", "would", "like", "can", "please", "a", "an", "intro", "vstupnu"},
+    },
+    "hours": {
+        "core": {"otvaracie", "hodiny", "otvorene", "otvoreni", "doba", "opening", "hours", "open", "dostupni", "available"},
+        "filler": {"kedy", "ste", "mate", "aka", "ake", "su", "je", "vasa", "vase", "pracovna", "when", "are", "you", "your",
+                   "what", "whats", "is", "do"},
+    },
+}
+
+# Articles and particles: allowed anywhere, but they do not explain a message either
+NEUTRAL_TOKENS = {"a", "an", "the", "to", "je", "sa", "si", "na", "v", "aj", "ja", "mi", "me", "my", "i", "so"}
+
+# Cancellations, changes and negations flip the meaning of any template; always leave them to the LLM
+VETO_TOKENS = {
+    "zrusit", "zrusim", "zruste", "zrusenie", "zrusil", "zrusila", "presunut", "presuniem", "presunutie",
+    "zmenit", "zmena", "zmenu", "nie", "nechcem", "nemozem", "neviem", "nikdy", "uz", "stornovat", "storno",
+    "not", "no", "dont", "don", "cant", "cannot", "t", "never", "cancel", "cancellation", "reschedule",
+    "postpone", "move", "change", "stop", "without",
+}
+
+TEMPLATES = {
+    "greeting": {
+        "sk": "Ahoj{name}! Som Tony z ArciGy. S čím ti môžem pomôcť? Rád ti poviem, čo všetko vieme zautomatizovať.",
+        "en": "Hi{name}! I'm Tony from ArciGy. How can I help you? Happy to walk you through what we can automate.",
+    },
+    "thanks": {
+        "sk": "Rado sa stalo{name_comma}! Ak budeš ešte niečo potrebovať, som tu.",
+        "en": "You're welcome{name_comma}! If you need anything else, I'm here.",
+    },
+    "booking": {
+        "sk": "Super, rád ti rezervujem 15-minútovú Vstupnú Diagnostiku. Pošli mi prosím meno, email a telefón (s predvoľbou +421/+420).",
+        "en": "Great, happy to book your 15-minute Intro Diagnostic. Please send me your name, email and phone (with country code).",
+    },
+    "hours": {
+        "sk": os.getenv("BUSINESS_HOURS_SK", "Ja som tu pre teba 24/7. Tím ArciGy ti odpovie v pracovných dňoch a termín diagnostiky si môžeš rezervovať kedykoľvek."),
+        "en": os.getenv("BUSINESS_HOURS_EN", "I'm here for you 24/7. The ArciGy team replies on business days, and you can book a diagnostic slot any time."),
+    },
+}
+
+def normalize(text):
+    stripped = unicodedata.normalize("NFKD", (text or "").lower())
+    stripped = "".join(c for c in stripped if not unicodedata.combining(c))
+    return re.findall(r"[a-z0-9]+", stripped)
+
+def detect_language(message, default="sk"):
+    """
+    Returns (lang, confidence) based on diacritics and marker words.
+    """
+    if any(c in SK_DIACRITICS for c in (message or "").lower()):
+        return "sk", 1.0
+    tokens = normalize(message)
+    sk = sum(1 for t in tokens if t in SK_MARKERS)
+    en = sum(1 for t in tokens if t in EN_MARKERS)
+    if sk == en:
+        return default, 0.5
+    lang = "sk" if sk > en else "en"
+    return lang, max(sk, en) / (sk + en)
+
+def classify_intent(message):
+    """
+    Returns (intent, confidence) for short trivial messages, or (None, 0.0).
+    Every token must belong to the intent's lexicon, a leading greeting or NEUTRAL_TOKENS;
+    any other content word vetoes the intent. Confidence is the share of lexicon tokens.
+    """
+    tokens = normalize(message)
+    if not tokens or len(tokens) > INTENT_MAX_WORDS:
+        return None, 0.0
+    if any(t in VETO_TOKENS for t in tokens):
+        return None, 0.0
+
+    greeting_core = INTENT_LEXICONS["greeting"]["core"]
+    best, best_score = None, 0.0
+    for intent, lex in INTENT_LEXICONS.items():
+        if not any(t in lex["core"] for t in tokens):
+            continue
+        # A leading greeting ("ahoj, chcem termín") is part of the real intent, not extra content
+        known = lex["core"] | lex["filler"] | (greeting_core if intent != "greeting" else set())
+        if any(t not in known and t not in NEUTRAL_TOKENS for t in tokens):
+            continue
+        score = sum(1 for t in tokens if t in known) / len(tokens)
+        if score > best_score or (score == best_score and intent != "greeting"):
+            best, best_score = intent, score
+    return best, best_score
+
+class LocalIntentFastPath:
+    """
+    Answers trivial chat turns (greetings, thanks, booking requests, opening hours)
+    with templated replies in the LLM's JSON schema; everything else goes to the LLM.
+    """
+    def __init__(self, threshold=INTENT_CONFIDENCE_THRESHOLD, enabled=LOCAL_INTENTS_ENABLED):
+        self.threshold = threshold
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stats = {"total": 0, "local_hits": 0, "by_intent": {k: 0 for k in INTENT_LEXICONS}}
+
+    def respond(self, message, lang=None, user_data=None, history=None):
+        """
+        Returns a response dict when the message is handled locally, otherwise None.
+        """
+        with self._lock:
+            self.stats["total"] += 1
+        if not self.enabled:
+            return None
+
+        intent, confidence = classify_intent(message)
+        if not intent or confidence < self.threshold:
+            return None
+
+        known = user_data if isinstance(user_data, dict) else {}
+        # With contact details already known, booking must go to the LLM (it sets action=book)
+        if intent == "booking" and all(known.get(k) and known.get(k) != "null" for k in ("fullName", "email", "phone")):
+            return None
+        # Mid-conversation the details may already be in the history (userData lags) and a greeting or
+        # thanks usually closes a question the LLM should answer in context; templates only open a chat
+        if history:
+            return None
+
+        lang = lang or detect_language(message)[0]
+        lang = lang if lang in ("sk", "en") else "en"
+        first_name = str(known.get("fullName") or "").split(" ")[0]
+        has_name = first_name and first_name != "null"
+
+        with self._lock:
+            self.stats["local_hits"] += 1
+            self.stats["by_intent"][intent] += 1
+
+        return {
+            "intention": "question",
+            "action": "null",
+            "forname": "null", "surname": "null", "email": "null", "phone": "null",
+            "extractedData": {},
+            "response": TEMPLATES[intent][lang].format(
+                name=f" {first_name}" if has_name else "",
+                name_comma=f", {first_name}" if has_name else ""
+            ),
+            "lang": lang,
+            "source": "local",
+            "local_intent": intent,
+            "confidence": round(confidence, 2)
+        }
+
+    def get_stats(self):
+        with self._lock:
+            stats = {**self.stats, "by_intent": dict(self.stats["by_intent"])}
+        stats["hit_rate"] = round(stats["local_hits"] / stats["total"], 3) if stats["total"] else 0
+        stats["threshold"] = self.threshold
+        return stats
+
+fast_path = LocalIntentFastPath()
@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from backend.utils.tracing import bind
+except ImportError:
+    from utils.tracing import bind
+
+# Hedging Config
+LLM_TURN_DEADLINE_SECONDS = float(os.getenv("LLM_TURN_DEADLINE_SECONDS", 12))
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 0.95))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", 3.0))  # used until enough samples exist
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", 1.0))
+LLM_HEDGE_MAX_DELAY = float(os.getenv("LLM_HEDGE_MAX_DELAY", 6.0))
+LLM_HEDGE_MIN_SAMPLES = 20
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() != "false"
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when no attempt produced a completion before the turn deadline."""
+
+def is_transient_error(error):
+    """
+    Default hedge filter: timeouts, connection errors, HTTP 429 and 5xx.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+class LatencyTracker:
+    """
+    Rolling window of latencies (seconds) with percentile lookup.
+    """
+    def __init__(self, size=200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        with self._lock:
+            self._samples.append(value)
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, int(round(q * (len(samples) - 1))))
+        return samples[idx]
+
+    def __len__(self):
+        return len(self._samples)
+
+class HedgedLLM:
+    """
+    Runs an LLM call with a per-turn deadline and fires one hedged duplicate
+    when the first attempt is slower than the observed p95.
+    """
+    def __init__(self, deadline=LLM_TURN_DEADLINE_SECONDS, hedge_enabled=LLM_HEDGE_ENABLED):
+        self.deadline = deadline
+        self.hedge_enabled = hedge_enabled
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+        self._lock = threading.Lock()
+        self.stats = {
+            "turns": 0, "hedges_fired": 0, "deadline_exceeded": 0,
+            "attempts": {"primary": 0, "hedge": 0},
+            "errors": {"primary": 0, "hedge": 0},
+            "wins": {"primary": 0, "hedge": 0},
+        }
+        self._attempt_latency = {"primary": LatencyTracker(), "hedge": LatencyTracker()}
+
+    def hedge_delay(self):
+        if len(self.latency) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        p = self.latency.percentile(LLM_HEDGE_PERCENTILE)
+        return max(LLM_HEDGE_MIN_DELAY, min(LLM_HEDGE_MAX_DELAY, p))
+
+    def _count(self, key, label=None):
+        with self._lock:
+            if label:
+                self.stats[key][label] += 1
+            else:
+                self.stats[key] += 1
+
+    def _attempt(self, label, create_fn, timeout, kwargs):
+        self._count("attempts", label)
+        started = time.monotonic()
+        try:
+            result = create_fn(timeout=timeout, **kwargs)
+        except Exception:
+            self._count("errors", label)
+            raise
+        elapsed = time.monotonic() - started
+        self._attempt_latency[label].add(elapsed)
+        return result, elapsed
+
+    def complete(self, create_fn, deadline=None, retryable=is_transient_error, **kwargs):
+        """
+        Calls create_fn(**kwargs) (e.g. openai_client.chat.completions.create) and returns
+        the first successful result. Raises LLMDeadlineExceeded if none arrives in time.
+        create_fn should not retry internally. A primary error that retryable(error) rejects
+        (e.g. a 400 or 401) is raised without hedging.
+        """
+        deadline = deadline or self.deadline
+        self._count("turns")
+        started = time.monotonic()
+        remaining = lambda: deadline - (time.monotonic() - started)
+
+        # bind() carries the trace into the executor threads, one span per attempt
+        futures = {self._executor.submit(bind(self._attempt, "llm.primary"), "primary", create_fn, deadline, kwargs): "primary"}
+        can_hedge = self.hedge_enabled
+        hedge_at = self.hedge_delay()
+        last_error = None
+
+        while futures and remaining() > 0:
+            # Until the hedge fires, only wait up to the hedge delay; afterwards, up to the deadline
+            wait_for = min(remaining(), hedge_at - (time.monotonic() - started)) if can_hedge else remaining()
+            done, _ = wait(list(futures), timeout=max(0, wait_for), return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                label = futures.pop(fut)
+                try:
+                    result, _ = fut.result()
+                except Exception as e:
+                    last_error = e
+                    if not retryable(e):
+                        can_hedge = False
+                    continue
+                # Whole-turn latency: a hedge win measured from its own (later) start would
+                # understate it, lower the p95 and make hedges fire more often
+                self.latency.add(time.monotonic() - started)
+                self._count("wins", label)
+                return result
+
+            # Fire the hedge once: primary is slower than p95, or it failed with a transient error
+            if can_hedge and (not futures or time.monotonic() - started >= hedge_at):
+                can_hedge = False
+                if remaining() > LLM_HEDGE_MIN_DELAY:
+                    self._count("hedges_fired")
+                    futures[self._executor.submit(bind(self._attempt, "llm.hedge"), "hedge", create_fn, remaining(), kwargs)] = "hedge"
+
+        if futures or last_error is None:
+            self._count("deadline_exceeded")
+            raise LLMDeadlineExceeded(f"No LLM completion within {deadline:.1f}s")
+        raise last_error
+
+    def get_stats(self):
+        with self._lock:
+            stats = {k: (dict(v) if isinstance(v, dict) else v) for k, v in self.stats.items()}
+        stats["hedge_delay"] = round(self.hedge_delay(), 3)
+        stats["latency"] = {
+            label: {f"p{int(q * 100)}": (round(t.percentile(q), 3) if len(t) else None) for q in (0.5, 0.95, 0.99)}
+            for label, t in self._attempt_latency.items()
+        }
+        wins = sum(stats["wins"].values())
+        stats["hedge_win_rate"] = round(stats["wins"]["hedge"] / wins, 3) if wins else 0
+        return stats
+
+chat_llm = HedgedLLM()
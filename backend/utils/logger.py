@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import copy
+import time
+import queue
+import atexit
+import random
+import logging
+import datetime
+import threading
+import logging.handlers
+
+try:
+    from backend.utils.tracing import current_request_id
+except ImportError:
+    from utils.tracing import current_request_id
+
+# Logging Config
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. "backend.calendar_engine=DEBUG,backend.utils.email_engine=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" (one object per line) or "text"
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))
+LOG_DEBUG_MAX_PER_SECOND = float(os.getenv("LOG_DEBUG_MAX_PER_SECOND", 20))
+LOG_QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else came in via extra={...}
+STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+class RequestContextFilter(logging.Filter):
+    """
+    Runs in the calling thread: stamps the request id (the contextvar is gone once the
+    record reaches the writer thread) and samples / rate-limits DEBUG records.
+    """
+    def __init__(self, sample_rate=LOG_DEBUG_SAMPLE_RATE, max_per_second=LOG_DEBUG_MAX_PER_SECOND):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.tokens = max_per_second
+        self.updated_at = time.monotonic()
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def _allow_debug(self):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.max_per_second, self.tokens + (now - self.updated_at) * self.max_per_second)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.suppressed += 1
+            return False
+
+    def filter(self, record):
+        if record.levelno <= logging.DEBUG and not self._allow_debug():
+            return False
+        record.request_id = current_request_id()
+        return True
+
+_exc_formatter = logging.Formatter()
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the writer falls behind."""
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+    def prepare(self, record):
+        # Unlike the stock prepare(), keep the traceback out of "msg" so it lands in its own field
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        extras = {k: v for k, v in record.__dict__.items() if k not in STANDARD_ATTRS}
+        rid = getattr(record, "request_id", None)
+        line = (f"{datetime.datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} {record.levelname:<7} "
+                f"{record.name}{f' [{rid}]' if rid else ''} {record.getMessage()}")
+        if extras:
+            line += " " + json.dumps(extras, ensure_ascii=False, default=str)
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+_listener = None
+_context_filter = None
+_setup_lock = threading.Lock()
+
+def setup_logging():
+    """
+    Routes the "arcigy" logger tree through a bounded queue to one writer thread,
+    so request threads and the event loop never block on stdout. Idempotent.
+    """
+    global _listener, _context_filter
+    with _setup_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _context_filter = RequestContextFilter()
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(_context_filter)
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root = logging.getLogger("arcigy")
+        root.handlers = [handler]
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+        for item in filter(None, (part.strip() for part in LOG_LEVELS.split(","))):
+            name, _, level = item.partition("=")
+            get_logger(name.strip()).setLevel(level.strip().upper())
+
+def get_logger(name):
+    """
+    Module logger under the "arcigy" tree: get_logger(__name__). Both "backend.x" and
+    "x" (local dev imports) map to the same logger, so LOG_LEVELS works either way.
+    """
+    if name.startswith("backend."):
+        name = name[len("backend."):]
+    return logging.getLogger(f"arcigy.{name}")
+
+def get_stats():
+    return {
+        "level": LOG_LEVEL, "format": LOG_FORMAT,
+        "dropped": DroppingQueueHandler.dropped,
+        "debug_suppressed": _context_filter.suppressed if _context_filter else 0,
+    }
+
+setup_logging()
@@ -0,0 +1,227 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import threading
+from collections import Counter
+
+# Profiling Config (off unless PROFILE_SAMPLE_RATE > 0 or a request carries a signed X-Profile header)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(ROOT_DIR, "data", "profiles"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "speedscope")  # "speedscope" or "collapsed"
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", 5)) / 1000
+PROFILE_MAX_SECONDS = 60  # the sampler stops itself after this, even if the request hangs
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 200))
+
+PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,80}$")
+# Leaf frames of threads that are parked, not working; their samples are dropped
+IDLE_LEAVES = {
+    ("selectors.py", "select"), ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+}
+SITE_MARKERS = ("site-packages" + os.sep, "dist-packages" + os.sep)
+
+def short_path(filename):
+    for marker in SITE_MARKERS:
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    if filename.startswith(ROOT_DIR):
+        return os.path.relpath(filename, ROOT_DIR)
+    return os.path.basename(filename)
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler. A daemon thread snapshots every thread's Python stack via
+    sys._current_frames() each `interval` seconds; nothing is hooked into the profiled code.
+    Samples cover the whole process (event loop + threadpool), so concurrent requests show up too.
+    """
+    def __init__(self, interval=PROFILE_INTERVAL, max_seconds=PROFILE_MAX_SECONDS):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples = Counter()  # (thread name, stack tuple) -> sampled wall time in ms
+        self.ticks = 0
+        self.started = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.duration = time.monotonic() - self.started
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        deadline = self.started + self.max_seconds
+        last = self.started
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            # Weight by the real gap: under GIL contention ticks arrive later than `interval`
+            now = time.monotonic()
+            elapsed_ms, last = (now - last) * 1000, now
+            self.ticks += 1
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(ident, str(ident)), tuple(stack))] += elapsed_ms
+
+    def to_collapsed(self):
+        """
+        Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope, inferno); values are ms.
+        """
+        lines = []
+        for (thread, stack), ms in sorted(self.samples.items(), key=lambda item: -item[1]):
+            frames = [thread] + [f"{name} ({short_path(path)}:{line})" for name, path, line in stack]
+            lines.append(f"{';'.join(frames)} {max(1, round(ms))}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name):
+        """
+        speedscope "sampled" file, one profile per thread (https://www.speedscope.app).
+        """
+        frames, frame_index, per_thread = [], {}, {}
+        for (thread, stack), ms in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": short_path(frame[1]), "line": frame[2]})
+                indices.append(frame_index[frame])
+            profile = per_thread.setdefault(thread, {"samples": [], "weights": []})
+            profile["samples"].append(indices)
+            profile["weights"].append(round(ms, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "arcigy-profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {"type": "sampled", "name": thread, "unit": "milliseconds", "startValue": 0,
+                 "endValue": round(sum(p["weights"]), 3), "samples": p["samples"], "weights": p["weights"]}
+                for thread, p in per_thread.items()
+            ],
+        }
+
+class ProfileStore:
+    """
+    One profile at a time per process; profiles land in PROFILE_DIR with a .meta.json sidecar.
+    """
+    def __init__(self, directory=PROFILE_DIR, fmt=PROFILE_FORMAT, sample_rate=PROFILE_SAMPLE_RATE):
+        self.directory = directory
+        self.fmt = fmt
+        self.sample_rate = sample_rate
+        self._busy = threading.Lock()
+        self.stats = {"profiled": 0, "busy_skipped": 0}
+
+    def should_sample(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self):
+        """
+        Returns a started SamplingProfiler, or None if another profile is running.
+        """
+        if not self._busy.acquire(blocking=False):
+            self.stats["busy_skipped"] += 1
+            return None
+        profiler = SamplingProfiler()
+        profiler.start()
+        return profiler
+
+    def finish(self, profiler, profile_id, meta):
+        """
+        Stops the profiler and writes the profile file. Returns the file name.
+        """
+        try:
+            profiler.stop()
+        finally:
+            self._busy.release()
+        self.stats["profiled"] += 1
+
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {**meta, "id": profile_id, "format": self.fmt, "duration_ms": round(profiler.duration * 1000, 1),
+                "samples": profiler.ticks, "created_at": time.time()}
+        if self.fmt == "collapsed":
+            filename, content = f"{profile_id}.collapsed.txt", profiler.to_collapsed()
+        else:
+            filename = f"{profile_id}.speedscope.json"
+            content = json.dumps(profiler.to_speedscope(f"{meta.get('method')} {meta.get('path')} ({profile_id})"))
+        with open(os.path.join(self.directory, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+        with open(os.path.join(self.directory, f"{profile_id}.meta.json"), "w", encoding="utf-8") as f:
+            json.dump({**meta, "file": filename}, f)
+        self._prune()
+        return filename
+
+    def _prune(self):
+        metas = sorted((e for e in os.scandir(self.directory) if e.name.endswith(".meta.json")),
+                       key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in metas[PROFILE_MAX_FILES:]:
+            stem = entry.name[:-len(".meta.json")]
+            for suffix in (".meta.json", ".collapsed.txt", ".speedscope.json"):
+                try:
+                    os.remove(os.path.join(self.directory, stem + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self, limit=100):
+        if not os.path.isdir(self.directory):
+            return []
+        metas = sorted((e for e in os.scandir(self.directory) if e.name.endswith(".meta.json")),
+                       key=lambda e: e.stat().st_mtime, reverse=True)[:limit]
+        out = []
+        for entry in metas:
+            try:
+                with open(entry.path, encoding="utf-8") as f:
+                    out.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return out
+
+    def profile_path(self, profile_id):
+        """
+        Absolute path of a stored profile, or None (ids are validated, no path traversal).
+        """
+        if not PROFILE_ID_RE.match(profile_id or ""):
+            return None
+        for suffix in (".speedscope.json", ".collapsed.txt"):
+            path = os.path.join(self.directory, profile_id + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_stats(self):
+        return {"sample_rate": self.sample_rate, "format": self.fmt, "dir": self.directory, **self.stats}
+
+profile_store = ProfileStore()
+
+if __name__ == "__main__":
+    # Usage: python -m backend.utils.profiler sign POST /webhook/chat  -> value for the X-Profile header
+    try:
+        from backend.utils.admin_auth import sign
+    except ImportError:
+        from utils.admin_auth import sign
+    if len(sys.argv) == 4 and sys.argv[1] == "sign":
+        print(sign(f"{sys.argv[2].upper()} {sys.argv[3]}"))
+    else:
+        print("Usage: python -m backend.utils.profiler sign <METHOD> <PATH>")
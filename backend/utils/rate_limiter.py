@@ -0,0 +1,139 @@
+import os
+import time
+import math
+import threading
+from collections import OrderedDict
+
+# Route classes for /webhook/* endpoints
+ROUTE_CLASSES = {
+    "/webhook/chat": "llm",
+    "/webhook/pre-audit-submit": "llm",
+    "/webhook/verify-email": "dns",
+    "/webhook/calendar-availability-check": "booking",
+    "/webhook/calendar-initiate-book": "booking",
+    "/webhook/audit-submit": "submit",
+}
+
+# (refill tokens per second, burst size) per client IP
+IP_LIMITS = {
+    "llm": (0.5, 6),
+    "dns": (2.0, 10),
+    "booking": (0.5, 5),
+    "submit": (0.2, 5),
+    "default": (2.0, 20),
+}
+# Per-conversation limit on top of the IP limit (chat only)
+CONVERSATION_LIMIT = (0.33, 4)
+# Max simultaneous in-flight requests per route class (expensive LLM routes only)
+CONCURRENCY_CAPS = {
+    "llm": int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+}
+
+BUCKET_IDLE_TTL = int(os.getenv("RATE_LIMIT_BUCKET_TTL", 300))
+MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", 50000))
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+# Proxies in front of the app that append to X-Forwarded-For (Railway's edge = 1); 0 ignores the header
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", 1))
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def take(self, now):
+        """
+        Takes one token. Returns 0 if admitted, otherwise seconds until a token is available.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class AdmissionController:
+    """
+    In-process admission control: token buckets keyed by (route class, key)
+    plus concurrency caps. Idle buckets expire so memory stays bounded.
+    """
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.stats = {"admitted": 0, "rate_limited": 0, "concurrency_limited": 0}
+
+    def _sweep(self, now):
+        # Buckets are kept in last-access order, so expired ones sit at the front
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated_at < BUCKET_IDLE_TTL and len(self._buckets) <= MAX_BUCKETS:
+                break
+            self._buckets.popitem(last=False)
+        self._last_sweep = now
+
+    def check(self, route_class, key, limit=None):
+        """
+        Returns 0 when the request is admitted, otherwise the Retry-After value in seconds.
+        """
+        if not RATE_LIMIT_ENABLED or not key:
+            return 0
+        rate, burst = limit or IP_LIMITS.get(route_class, IP_LIMITS["default"])
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep > 30 or len(self._buckets) > MAX_BUCKETS:
+                self._sweep(now)
+            bucket_key = (route_class, key)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self._buckets[bucket_key] = TokenBucket(rate, burst, now)
+            else:
+                self._buckets.move_to_end(bucket_key)
+            wait = bucket.take(now)
+            self.stats["admitted" if wait == 0 else "rate_limited"] += 1
+        return math.ceil(wait)
+
+    def check_conversation(self, conversation_id):
+        return self.check("conversation", conversation_id, CONVERSATION_LIMIT)
+
+    def try_acquire(self, route_class):
+        cap = CONCURRENCY_CAPS.get(route_class)
+        if not RATE_LIMIT_ENABLED or cap is None:
+            return True
+        with self._lock:
+            if self._in_flight.get(route_class, 0) >= cap:
+                self.stats["concurrency_limited"] += 1
+                return False
+            self._in_flight[route_class] = self._in_flight.get(route_class, 0) + 1
+            return True
+
+    def release(self, route_class):
+        if not RATE_LIMIT_ENABLED or route_class not in CONCURRENCY_CAPS:
+            return
+        with self._lock:
+            self._in_flight[route_class] = max(0, self._in_flight.get(route_class, 0) - 1)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, "buckets": len(self._buckets), "in_flight": dict(self._in_flight)}
+
+def classify_route(path):
+    return ROUTE_CLASSES.get(path.rstrip("/"), "default")
+
+def client_ip(request, trusted_hops=TRUSTED_PROXY_HOPS):
+    """
+    The address our own proxies saw. Hops left of the ones they appended are client-controlled,
+    so they are never used (a spoofed X-Forwarded-For would get a fresh bucket per request).
+    """
+    forwarded = request.headers.get("x-forwarded-for") if trusted_hops > 0 else None
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        if hops:
+            return hops[-min(trusted_hops, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+admission = AdmissionController()
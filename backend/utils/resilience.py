@@ -0,0 +1,220 @@
+import os
+import time
+import random
+import threading
+import requests
+
+try:
+    from backend.utils.tracing import span
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.tracing import span
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Per-endpoint policies for outbound integrations.
+# timeout = (connect, read) seconds per attempt, deadline = total budget incl. retries.
+ENDPOINT_POLICIES = {
+    "cal.availability": {"provider": "calcom", "timeout": (3.05, 5), "deadline": 9, "retries": 2, "idempotent": True},
+    "cal.book": {"provider": "calcom", "timeout": (3.05, 12), "deadline": 15, "retries": 0, "idempotent": False},
+    "cal.cancel": {"provider": "calcom", "timeout": (3.05, 8), "deadline": 12, "retries": 1, "idempotent": True},
+    "brevo.send": {"provider": "brevo", "timeout": (3.05, 5), "deadline": 6, "retries": 0, "idempotent": False},
+    # Batches carry row ids the Apps Script dedupes on, so replays are safe
+    "sheets.append": {"provider": "sheets", "timeout": (3.05, 30), "deadline": 60, "retries": 2, "idempotent": True},
+}
+DEFAULT_POLICY = {"provider": "default", "timeout": (3.05, 10), "deadline": 12, "retries": 0, "idempotent": False}
+
+# Circuit Breaker Config
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RECOVERY_SECONDS = float(os.getenv("BREAKER_RECOVERY_SECONDS", 30))
+
+# Retry Budget Config (retries allowed as a fraction of recent calls)
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", 0.2))
+RETRY_BUDGET_MAX = float(os.getenv("RETRY_BUDGET_MAX", 10))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's breaker is open and the call is rejected without I/O."""
+    def __init__(self, provider, retry_in):
+        super().__init__(f"Circuit open for '{provider}' (retry in {retry_in:.1f}s)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half_open breaker driven by consecutive failures.
+    """
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, recovery_seconds=BREAKER_RECOVERY_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.stats = {"success": 0, "failure": 0, "rejected": 0, "opened": 0}
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.recovery_seconds:
+                self.state = "half_open"
+                self.probe_in_flight = False
+            if self.state == "half_open" and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def retry_in(self):
+        with self._lock:
+            return max(0.0, self.recovery_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.stats["success"] += 1
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+            if self.state != "closed":
+                log.info("circuit closed", extra={"circuit": self.name})
+            self.state = "closed"
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failure"] += 1
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.stats["opened"] += 1
+                    log.warning("circuit open", extra={"circuit": self.name, "consecutive_failures": self.consecutive_failures})
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in": round(max(0.0, self.recovery_seconds - (time.monotonic() - self.opened_at)), 1) if self.state == "open" else 0,
+                **self.stats
+            }
+
+class RetryBudget:
+    """
+    Token bucket that earns `ratio` tokens per call, so retries never exceed that share of traffic.
+    """
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, max_tokens=RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+_breakers = {}
+_budgets = {}
+_registry_lock = threading.Lock()
+
+def get_breaker(provider):
+    with _registry_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+            _budgets[provider] = RetryBudget()
+        return _breakers[provider]
+
+def _get_budget(provider):
+    get_breaker(provider)
+    return _budgets[provider]
+
+def get_breaker_states():
+    """
+    Exports the state of every known circuit breaker (for the status endpoint).
+    """
+    with _registry_lock:
+        breakers = dict(_breakers)
+        budgets = dict(_budgets)
+    return {
+        name: {**b.snapshot(), "retry_budget": round(budgets[name].tokens, 2)}
+        for name, b in breakers.items()
+    }
+
+def is_available(provider):
+    """
+    Cheap check callers can use to route straight to a fallback without attempting the call.
+    """
+    breaker = get_breaker(provider)
+    return breaker.state != "open" or breaker.retry_in() == 0
+
+def resilient_request(method, url, endpoint, **kwargs):
+    """
+    requests.request() with the endpoint's deadline, budgeted retries and circuit breaker.
+    Returns the final Response (callers keep checking response.ok) or raises
+    CircuitOpenError / the last requests exception.
+    """
+    with span(f"{method} {endpoint}", kind="client", endpoint=endpoint, url=url.split("?")[0]) as sp:
+        response = _request_with_policy(method, url, endpoint, sp, **kwargs)
+        if sp:
+            sp.set(status_code=response.status_code)
+        return response
+
+def _request_with_policy(method, url, endpoint, sp, **kwargs):
+    policy = ENDPOINT_POLICIES.get(endpoint, DEFAULT_POLICY)
+    provider = policy["provider"]
+    breaker = get_breaker(provider)
+    budget = _get_budget(provider)
+    budget.deposit()
+
+    started = time.monotonic()
+    connect_timeout, read_timeout = policy["timeout"]
+    max_attempts = 1 + (policy["retries"] if policy["idempotent"] else 0)
+    attempt = 0
+
+    while True:
+        if not breaker.allow_request():
+            raise CircuitOpenError(provider, breaker.retry_in())
+
+        attempt += 1
+        if sp:
+            sp.set(attempts=attempt)
+        remaining = policy["deadline"] - (time.monotonic() - started)
+        timeout = (min(connect_timeout, remaining), max(0.1, min(read_timeout, remaining)))
+        response, error = None, None
+        try:
+            response = requests.request(method, url, timeout=timeout, **kwargs)
+        except Exception as e:
+            error = e
+
+        failed = error is not None or response.status_code in RETRYABLE_STATUS
+        if not failed:
+            breaker.record_success()
+            return response
+        breaker.record_failure()
+
+        # Decide whether another attempt fits in budget and deadline
+        backoff = min(2.0, 0.2 * (2 ** (attempt - 1))) * random.uniform(0.5, 1.0)
+        remaining = policy["deadline"] - (time.monotonic() - started) - backoff
+        can_retry = (attempt < max_attempts and breaker.state == "closed"
+                     and remaining > connect_timeout and budget.withdraw())
+        if not can_retry:
+            if error is not None:
+                raise error
+            return response
+
+        reason = error if error is not None else f"HTTP {response.status_code}"
+        log.info("retrying request", extra={"endpoint": endpoint, "attempt": attempt,
+                                            "max_retries": max_attempts - 1, "reason": str(reason)})
+        time.sleep(backoff)
@@ -0,0 +1,193 @@
+import os
+import time
+import random
+import asyncio
+import datetime
+from zoneinfo import ZoneInfo
+
+try:
+    from backend.utils.tracing import start_trace
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.tracing import start_trace
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Scheduler Config
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() != "false"
+SCHEDULER_TZ = ZoneInfo(os.getenv("SCHEDULER_TZ", "Europe/Bratislava"))
+
+class IntervalTrigger:
+    """Runs every `seconds`, plus up to `jitter` random seconds."""
+    def __init__(self, seconds, jitter=0, run_immediately=False):
+        self.seconds = seconds
+        self.jitter = jitter
+        self.run_immediately = run_immediately
+
+    def next_after(self, now, first=False):
+        if first and self.run_immediately:
+            return now + datetime.timedelta(seconds=random.uniform(0, self.jitter))
+        return now + datetime.timedelta(seconds=self.seconds + random.uniform(0, self.jitter))
+
+    def __repr__(self):
+        return f"every {self.seconds}s"
+
+class CronTrigger:
+    """
+    Minimal 5-field cron ("min hour day month weekday") with *, */n, a-b and a,b syntax.
+    Weekday 0 = Sunday (7 is also accepted).
+    """
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression, jitter=0):
+        self.expression = expression
+        self.jitter = jitter
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.fields = [self._parse(p, lo, hi) for p, (lo, hi) in zip(parts, self.RANGES)]
+        self.fields[4] = {d % 7 for d in self.fields[4]}
+
+    @staticmethod
+    def _parse(field, lo, hi):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = map(int, part.split("-"))
+            else:
+                start = end = int(part)
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, dt):
+        minute, hour, day, month, weekday = self.fields
+        return (dt.minute in minute and dt.hour in hour and dt.day in day
+                and dt.month in month and (dt.isoweekday() % 7) in weekday)
+
+    def next_after(self, now, first=False):
+        candidate = now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        for _ in range(366 * 24 * 60):
+            if self.matches(candidate):
+                return candidate + datetime.timedelta(seconds=random.uniform(0, self.jitter))
+            candidate += datetime.timedelta(minutes=1)
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+    def __repr__(self):
+        return f"cron '{self.expression}'"
+
+class Job:
+    def __init__(self, name, func, trigger, single_instance=True):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.single_instance = single_instance
+        self.next_run = None
+        self.metrics = {
+            "runs": 0, "failures": 0, "skipped_locked": 0,
+            "last_started": None, "last_duration": None, "total_duration": 0.0,
+            "last_status": None, "last_error": None
+        }
+
+class AsyncScheduler:
+    """
+    In-process async scheduler. Jobs are sync callables (run_scheduled_task style)
+    executed in a thread; single-instance jobs hold a Postgres advisory lock while they run,
+    so only one worker/replica executes a given job at a time.
+    """
+    def __init__(self, connection_factory=None, tz=SCHEDULER_TZ):
+        self.connection_factory = connection_factory
+        self.tz = tz
+        self.jobs = {}
+        self._tasks = []
+
+    def add_job(self, name, func, trigger, single_instance=True):
+        self.jobs[name] = Job(name, func, trigger, single_instance)
+
+    def _run_locked(self, job):
+        """
+        Runs the job inside a transaction holding pg_try_advisory_xact_lock.
+        Returns (ran, result).
+        """
+        conn = self.connection_factory() if (job.single_instance and self.connection_factory) else None
+        if not conn:
+            if job.single_instance and self.connection_factory:
+                log.warning("no DB connection for job lock, running unlocked", extra={"job": job.name})
+            return True, job.func()
+        try:
+            with conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_try_advisory_xact_lock(hashtext(%s))", (f"job:{job.name}",))
+                    if not cur.fetchone()[0]:
+                        return False, None
+                    return True, job.func()
+        finally:
+            conn.close()
+
+    def _run_traced(self, job):
+        with start_trace(f"job {job.name}", kind="internal", trigger=repr(job.trigger)):
+            return self._run_locked(job)
+
+    async def run_job(self, job):
+        started = time.monotonic()
+        job.metrics["last_started"] = datetime.datetime.now(self.tz).isoformat()
+        try:
+            ran, result = await asyncio.to_thread(self._run_traced, job)
+            if not ran:
+                job.metrics["skipped_locked"] += 1
+                job.metrics["last_status"] = "skipped_locked"
+                return
+            job.metrics["runs"] += 1
+            status = result.get("status") if isinstance(result, dict) else "success"
+            job.metrics["last_status"] = status
+            if status == "error":
+                job.metrics["failures"] += 1
+                job.metrics["last_error"] = result.get("message")
+        except Exception as e:
+            job.metrics["runs"] += 1
+            job.metrics["failures"] += 1
+            job.metrics["last_status"] = "error"
+            job.metrics["last_error"] = str(e)
+            log.exception("scheduled job failed", extra={"job": job.name})
+        finally:
+            duration = time.monotonic() - started
+            job.metrics["last_duration"] = round(duration, 3)
+            job.metrics["total_duration"] += duration
+
+    async def _job_loop(self, job):
+        first = True
+        while True:
+            now = datetime.datetime.now(self.tz)
+            job.next_run = job.trigger.next_after(now, first=first)
+            first = False
+            await asyncio.sleep(max(0, (job.next_run - now).total_seconds()))
+            await self.run_job(job)
+
+    def start(self):
+        if not SCHEDULER_ENABLED or self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._job_loop(job)) for job in self.jobs.values()]
+        log.info("scheduler started", extra={"jobs": {j.name: repr(j.trigger) for j in self.jobs.values()}})
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get_metrics(self):
+        out = {}
+        for name, job in self.jobs.items():
+            m = dict(job.metrics)
+            m["avg_duration"] = round(m.pop("total_duration") / m["runs"], 3) if m["runs"] else None
+            m["trigger"] = repr(job.trigger)
+            m["next_run"] = job.next_run.isoformat() if job.next_run else None
+            out[name] = m
+        return {"enabled": SCHEDULER_ENABLED, "jobs": out}
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+
+try:
+    from backend.utils.logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Shared Cache Config
+# One SQLite file per node, read and written by every uvicorn worker. /dev/shm keeps it in RAM.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SHM_DIR = "/dev/shm"
+DEFAULT_PATH = (os.path.join(SHM_DIR, "arcigy_shared_cache.sqlite")
+                if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK)
+                else os.path.join(ROOT_DIR, "data", "shared_cache.sqlite"))
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", DEFAULT_PATH)
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", 20000))
+SWEEP_EVERY_WRITES = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_expires_idx ON cache (expires_at);
+"""
+
+class SharedCache:
+    """
+    Cross-process key/value store with TTLs (JSON values) on a SQLite WAL file.
+    Every worker on the node sees one copy, so a value fetched by one is reused by all.
+    Failures degrade to cache misses; the cache never breaks a request.
+    """
+    def __init__(self, path=SHARED_CACHE_PATH, max_entries=SHARED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # a cache: losing the tail on power loss is fine
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, key):
+        """
+        Returns (value, age in seconds) for an unexpired key, or None.
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT value, stored_at FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache read failed", extra={"key": key, "error": str(e)})
+            return None
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return json.loads(row[0]), time.time() - row[1]
+
+    def get(self, key, default=None, max_age=None):
+        """
+        Value for key, or default if missing, expired or older than max_age seconds.
+        """
+        entry = self.get_entry(key)
+        if entry is None or (max_age is not None and entry[1] >= max_age):
+            return default
+        return entry[0]
+
+    def set(self, key, value, ttl):
+        try:
+            now = time.time()
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, default=str), now, now + ttl)
+            )
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache write failed", extra={"key": key, "error": str(e)})
+            return
+        self.stats["writes"] += 1
+        self._writes += 1
+        if self._writes % SWEEP_EVERY_WRITES == 0:
+            self.sweep()
+
+    def add(self, key, value, ttl):
+        """
+        Stores value only if key is absent or expired, atomically across processes.
+        Returns True if this call stored it; None if the cache failed (caller decides).
+        """
+        try:
+            now = time.time()
+            stored = self._conn().execute(
+                "INSERT INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, stored_at = excluded.stored_at, "
+                "expires_at = excluded.expires_at WHERE cache.expires_at <= ?",
+                (key, json.dumps(value, ensure_ascii=False, default=str), now, now + ttl, now)
+            ).rowcount
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache add failed", extra={"key": key, "error": str(e)})
+            return None
+        self.stats["writes"] += stored
+        return stored == 1
+
+    def mark_stale(self, key):
+        """
+        Forces the next max_age check to refetch, keeping the value as a stale fallback.
+        """
+        try:
+            self._conn().execute("UPDATE cache SET stored_at = 0 WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache update failed", extra={"key": key, "error": str(e)})
+
+    def delete(self, key):
+        try:
+            self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache delete failed", extra={"key": key, "error": str(e)})
+
+    def items(self, prefix):
+        """
+        Unexpired (key, value, stored_at, expires_at) rows whose key starts with prefix.
+        """
+        try:
+            rows = self._conn().execute(
+                "SELECT key, value, stored_at, expires_at FROM cache WHERE key >= ? AND key < ? AND expires_at > ?",
+                (prefix, prefix + "\uffff", time.time())
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache scan failed", extra={"prefix": prefix, "error": str(e)})
+            return []
+        return [(key, json.loads(value), stored_at, expires_at) for key, value, stored_at, expires_at in rows]
+
+    def sweep(self):
+        """
+        Drops expired rows, then the oldest ones beyond max_entries. Returns rows removed.
+        """
+        try:
+            conn = self._conn()
+            removed = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            removed += conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            return removed
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            log.warning("shared cache sweep failed", extra={"error": str(e)})
+            return 0
+
+    def get_stats(self):
+        try:
+            entries = self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {"path": self.path, "entries": entries, "pid": os.getpid(), **self.stats}
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_shared_cache():
+    """
+    Process-wide SharedCache. Falls back to a private temp file if SHARED_CACHE_PATH is unusable.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = SharedCache()
+            except (OSError, sqlite3.Error) as e:
+                fallback = os.path.join(tempfile.gettempdir(), f"arcigy_shared_cache_{os.getpid()}.sqlite")
+                log.warning("shared cache unavailable, using a private file",
+                            extra={"path": SHARED_CACHE_PATH, "fallback": fallback, "error": str(e)})
+                _default_cache = SharedCache(path=fallback)
+        return _default_cache
@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import queue
+import random
+import secrets
+import logging
+import threading
+import functools
+import contextvars
+import urllib.request
+from contextlib import contextmanager
+
+# Tracing Config (TRACE_EXPORT: "" = off, "file" = JSON lines in TRACE_FILE, "otlp" = OTLP/HTTP JSON)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(ROOT_DIR, "data", "traces.jsonl"))
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 1.0))
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "arcigy-backend")
+TRACE_BATCH_SIZE = 256
+TRACE_FLUSH_SECONDS = 2.0
+TRACE_QUEUE_SIZE = 10000  # spans beyond this are dropped rather than blocking requests
+
+# OTLP SpanKind values
+KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+# Plain logging.getLogger: logger.py imports this module for request ids, so get_logger would be circular
+log = logging.getLogger("arcigy.utils.tracing")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+# Set for every /webhook/* request, traced or not (log correlation)
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, trace_id, parent_id=None, kind="internal", attributes=None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+            "name": self.name, "kind": self.kind, "start_ns": self.start_ns, "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3), "attributes": self.attributes,
+            "error": self.error
+        }
+
+class SpanExporter:
+    """
+    Background thread that batches finished spans to a JSON-lines file or an OTLP/HTTP endpoint.
+    Requests only pay for a queue put.
+    """
+    def __init__(self, mode=TRACE_EXPORT):
+        self.mode = mode
+        self._queue = queue.Queue(maxsize=TRACE_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"exported": 0, "dropped": 0, "export_errors": 0}
+
+    def submit(self, span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + TRACE_FLUSH_SECONDS
+            while len(batch) < TRACE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.export(batch)
+                self.stats["exported"] += len(batch)
+            except Exception as e:
+                self.stats["export_errors"] += 1
+                log.warning("trace export failed", extra={"spans_dropped": len(batch), "error": str(e)})
+
+    def export(self, spans):
+        if self.mode == "otlp":
+            body = json.dumps(to_otlp(spans)).encode("utf-8")
+            request = urllib.request.Request(TRACE_OTLP_ENDPOINT, data=body, headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+            return
+        os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def get_stats(self):
+        return {"mode": self.mode or "off", "sample_rate": TRACE_SAMPLE_RATE,
+                "queued": self._queue.qsize(), **self.stats}
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(spans):
+    """
+    OTLP/HTTP JSON payload (ExportTraceServiceRequest) for a batch of spans.
+    """
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+        "scopeSpans": [{
+            "scope": {"name": "arcigy.tracing"},
+            "spans": [{
+                "traceId": s.trace_id, "spanId": s.span_id, "parentSpanId": s.parent_id or "",
+                "name": s.name, "kind": KINDS.get(s.kind, 1),
+                "startTimeUnixNano": str(s.start_ns), "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1}
+            } for s in spans]
+        }]
+    }]}
+
+exporter = SpanExporter()
+
+def enabled():
+    return bool(TRACE_EXPORT)
+
+def current_span():
+    return _current_span.get()
+
+def current_trace_id():
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+def set_request_id(value=None):
+    """
+    Sets the request id for the current context (a new one if not given) and returns it.
+    """
+    value = value or secrets.token_hex(8)
+    _request_id.set(value)
+    return value
+
+def current_request_id():
+    return _request_id.get() or current_trace_id()
+
+def traceparent():
+    """
+    W3C traceparent for the current span (for queue rows / outbound headers), or None.
+    """
+    span = _current_span.get()
+    return f"00-{span.trace_id}-{span.span_id}-01" if span else None
+
+def parse_traceparent(value):
+    """
+    Returns (trace_id, parent_span_id) from a W3C traceparent, or (None, None).
+    """
+    parts = (value or "").split("-")
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+        return parts[1], parts[2]
+    return None, None
+
+@contextmanager
+def _activate(span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.submit(span)
+
+@contextmanager
+def start_trace(name, parent=None, kind="server", **attributes):
+    """
+    Opens a root span (new trace, or continuing a W3C `parent` traceparent).
+    Yields None when tracing is off or the trace is not sampled.
+    """
+    trace_id, parent_id = parse_traceparent(parent)
+    if not TRACE_EXPORT or (trace_id is None and random.random() >= TRACE_SAMPLE_RATE):
+        yield None
+        return
+    with _activate(Span(name, trace_id or secrets.token_hex(16), parent_id, kind, attributes)) as span:
+        yield span
+
+@contextmanager
+def span(name, kind="internal", **attributes):
+    """
+    Child span of the current span. A no-op (yields None) outside a trace.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    with _activate(Span(name, parent.trace_id, parent.span_id, kind, attributes)) as child:
+        yield child
+
+def bind(fn, name=None):
+    """
+    Captures the current trace context so fn keeps it when it runs later or in another thread
+    (BackgroundTasks, executors). With `name`, the call is recorded as its own span.
+    """
+    if _current_span.get() is None and _request_id.get() is None:
+        return fn
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        def call():
+            if name is None:
+                return fn(*args, **kwargs)
+            with span(name, background=True):
+                return fn(*args, **kwargs)
+        return context.copy().run(call)
+    return wrapper
+
+def get_stats():
+    return exporter.get_stats()
@@ -1,60 +1,96 @@
+// Column order of the sheet after the Timestamp column.
+// Must match SHEET_FIELDS in backend/sheets_sync.py and the headers created by setup().
+var FIELD_MAPPING = [
+    "name", "email", "business_name", "industry", "employees",
+    "what_sell", "typical_customer", "source",
+    "top_tasks", "magic_wand",
+    "leads_challenge",
+    "sales_team", "closing_issues",
+    "delivery_time", "ops_recurring",
+    "support_headaches",
+    "ai_experience", "which_ai_tools",
+    "success_definition", "specific_focus"
+];
+
+// Row ids already written are remembered for this long, so a replayed batch is not appended twice
+var DEDUPE_TTL_SECONDS = 21600; // 6h (CacheService maximum)
+
+function toRow(data) {
+    var row = [data.timestamp ? new Date(data.timestamp) : new Date()];
+
+    // If source is an array, join it
+    if (Array.isArray(data.source)) {
+        data.source = data.source.join(", ");
+    }
+
+    for (var i = 0; i < FIELD_MAPPING.length; i++) {
+        var key = FIELD_MAPPING[i];
+        row.push(data[key] || "");
+    }
+    return row;
+}
+
 function doPost(e) {
     var lock = LockService.getScriptLock();
-    lock.tryLock(10000);
+    if (!lock.tryLock(10000)) {
+        // Report busy instead of writing unlocked; the backend retries the batch later
+        return ContentService
+            .createTextOutput(JSON.stringify({ "result": "error", "error": "lock timeout" }))
+            .setMimeType(ContentService.MimeType.JSON);
+    }
 
     try {
         var sheet = SpreadsheetApp.getActiveSpreadsheet().getActiveSheet();
-        var headers = sheet.getRange(1, 1, 1, sheet.getLastColumn()).getValues()[0];
-        var nextRow = sheet.getLastRow() + 1;
-
-        // Parse the data sent from the HTML form
         var data = JSON.parse(e.postData.contents);
-        var newRow = [];
 
-        // Add Timestamp
-        newRow.push(new Date());
+        // Batched payload from backend/sheets_sync.py: {"batch_id": "...", "rows": [{...}, ...]}
+        // A plain object (legacy single-row POST) is treated as a batch of one.
+        var items = Array.isArray(data.rows) ? data.rows : [data];
 
-        // Loop through headers (start at index 1 to skip Timestamp if you added it manually, 
-        // but here we align with data keys)
-        // Note: You must set up headers in Row 1 of your Sheet exactly matching these keys:
-        // name, email, business_name, industry, employees, what_sell, typical_customer, 
-        // source, top_tasks, magic_wand, leads_challenge, sales_team, closing_issues, 
-        // delivery_time, ops_recurring, support_headaches, ai_experience, which_ai_tools, 
-        // success_definition, specific_focus
-
-        // Simplification: We will just map specific known keys to columns
-        var fieldMapping = [
-            "name", "email", "business_name", "industry", "employees",
-            "what_sell", "typical_customer", "source",
-            "top_tasks", "magic_wand",
-            "leads_challenge",
-            "sales_team", "closing_issues",
-            "delivery_time", "ops_recurring",
-            "support_headaches",
-            "ai_experience", "which_ai_tools",
-            "success_definition", "specific_focus"
-        ];
-
-        // If source is an array, join it
-        if (Array.isArray(data.source)) {
-            data.source = data.source.join(", ");
+        // Drop rows whose id was already written (at-least-once delivery from the backend)
+        var cache = CacheService.getScriptCache();
+        var keys = [];
+        for (var i = 0; i < items.length; i++) {
+            if (items[i].id !== undefined && items[i].id !== null) {
+                keys.push("intake:" + items[i].id);
+            }
         }
+        var seen = keys.length ? cache.getAll(keys) : {};
 
-        // Build the row
-        for (var i = 0; i < fieldMapping.length; i++) {
-            var key = fieldMapping[i];
-            newRow.push(data[key] || "");
+        var newRows = [];
+        var written = {};
+        for (var j = 0; j < items.length; j++) {
+            var id = items[j].id;
+            if (id !== undefined && id !== null && seen["intake:" + id]) {
+                continue;
+            }
+            newRows.push(toRow(items[j]));
+            if (id !== undefined && id !== null) {
+                written["intake:" + id] = "1";
+            }
         }
 
-        sheet.getRange(nextRow, 1, 1, newRow.length).setValues([newRow]);
+        var firstRow = sheet.getLastRow() + 1;
+        if (newRows.length) {
+            // One range write for the whole batch
+            sheet.getRange(firstRow, 1, newRows.length, newRows[0].length).setValues(newRows);
+            SpreadsheetApp.flush();
+            cache.putAll(written, DEDUPE_TTL_SECONDS);
+        }
 
         return ContentService
-            .createTextOutput(JSON.stringify({ "result": "success", "row": nextRow }))
+            .createTextOutput(JSON.stringify({
+                "result": "success",
+                "batch_id": data.batch_id || null,
+                "row": firstRow,
+                "written": newRows.length,
+                "skipped": items.length - newRows.length
+            }))
             .setMimeType(ContentService.MimeType.JSON);
 
     } catch (e) {
         return ContentService
-            .createTextOutput(JSON.stringify({ "result": "error", "error": e }))
+            .createTextOutput(JSON.stringify({ "result": "error", "error": String(e) }))
             .setMimeType(ContentService.MimeType.JSON);
     } finally {
         lock.releaseLock();
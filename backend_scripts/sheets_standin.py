@@ -0,0 +1,119 @@
+"""
+Local stand-in for the Google Apps Script web app (google_apps_script.js), for throughput tests.
+
+It mimics the parts that matter for performance: one script lock serializing every doPost,
+a fixed per-call overhead and a small per-row cost for the range write, plus row-id dedupe.
+
+    python backend_scripts/sheets_standin.py serve --port 8765 --call-latency 0.8
+    SHEETS_WEBHOOK_URL=http://127.0.0.1:8765 python -m backend.sheets_sync
+    python backend_scripts/sheets_standin.py bench --url http://127.0.0.1:8765 --rows 2000 --batch 1 --concurrency 8
+    python backend_scripts/sheets_standin.py bench --url http://127.0.0.1:8765 --rows 2000 --batch 200
+"""
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class SheetState:
+    def __init__(self, call_latency, row_latency):
+        self.call_latency = call_latency
+        self.row_latency = row_latency
+        self.script_lock = threading.Lock()
+        self.rows = []
+        self.seen_ids = set()
+        self.stats = {"calls": 0, "written": 0, "skipped": 0, "lock_wait_total": 0.0}
+
+    def append(self, items):
+        arrived = time.monotonic()
+        with self.script_lock:
+            self.stats["lock_wait_total"] += time.monotonic() - arrived
+            new = [item for item in items if item.get("id") is None or item["id"] not in self.seen_ids]
+            time.sleep(self.call_latency + self.row_latency * len(new))
+            first_row = len(self.rows) + 2
+            self.rows.extend(new)
+            self.seen_ids.update(item["id"] for item in new if item.get("id") is not None)
+            self.stats["calls"] += 1
+            self.stats["written"] += len(new)
+            self.stats["skipped"] += len(items) - len(new)
+            return first_row, len(new)
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, body, status=200):
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self):
+            try:
+                data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                items = data["rows"] if isinstance(data.get("rows"), list) else [data]
+                first_row, written = state.append(items)
+                self._send({"result": "success", "batch_id": data.get("batch_id"), "row": first_row,
+                            "written": written, "skipped": len(items) - written})
+            except Exception as e:
+                self._send({"result": "error", "error": str(e)})
+
+        def do_GET(self):
+            self._send({**state.stats, "total_rows": len(state.rows)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(args):
+    state = SheetState(args.call_latency, args.row_latency)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"📊 Sheets stand-in on http://127.0.0.1:{args.port} "
+          f"(call latency {args.call_latency}s, row latency {args.row_latency * 1000:.1f}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{json.dumps(state.stats, indent=2)}")
+
+def bench(args):
+    fields = ["name", "email", "business_name", "industry", "employees"]
+    rows = [{"id": i, **{f: f"{f}-{i}" for f in fields}} for i in range(args.offset, args.offset + args.rows)]
+    batches = [rows[i:i + args.batch] for i in range(0, len(rows), args.batch)]
+
+    def post(batch):
+        payload = {"batch_id": f"bench:{batch[0]['id']}-{batch[-1]['id']}", "rows": batch}
+        request = urllib.request.Request(args.url, data=json.dumps(payload).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return json.loads(response.read())
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(post, batches))
+    elapsed = time.monotonic() - started
+    written = sum(r.get("written", 0) for r in results)
+    errors = sum(1 for r in results if r.get("result") != "success")
+    print(f"{len(rows)} rows in {len(batches)} POST(s) of {args.batch}: {elapsed:.2f}s, "
+          f"{written / elapsed:.1f} rows/s, {errors} error(s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apps Script stand-in and throughput bench.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--call-latency", type=float, default=0.8, help="Fixed seconds per doPost")
+    p_serve.add_argument("--row-latency", type=float, default=0.002, help="Seconds per written row")
+
+    p_bench = sub.add_parser("bench")
+    p_bench.add_argument("--url", default="http://127.0.0.1:8765")
+    p_bench.add_argument("--rows", type=int, default=1000)
+    p_bench.add_argument("--batch", type=int, default=200)
+    p_bench.add_argument("--concurrency", type=int, default=1)
+    p_bench.add_argument("--offset", type=int, default=0, help="First row id (reuse ids to test dedupe)")
+
+    args = parser.parse_args()
+    serve(args) if args.command == "serve" else bench(args)
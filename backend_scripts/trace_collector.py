@@ -0,0 +1,142 @@
+"""
+Minimal OTLP/HTTP (JSON) collector stand-in plus a terminal waterfall viewer for traces.
+
+    python backend_scripts/trace_collector.py serve --port 4318 --out data/collected_traces.jsonl
+    TRACE_EXPORT=otlp TRACE_OTLP_ENDPOINT=http://127.0.0.1:4318/v1/traces uvicorn backend.main_router:app
+    python backend_scripts/trace_collector.py show data/collected_traces.jsonl --last 5
+    python backend_scripts/trace_collector.py show data/traces.jsonl --trace <trace_id>   (TRACE_EXPORT=file output)
+"""
+import os
+import json
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+KIND_NAMES = {1: "internal", 2: "server", 3: "client", 4: "producer", 5: "consumer"}
+
+def _attr_value(value):
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+def from_otlp(payload):
+    """
+    Flattens an ExportTraceServiceRequest into the span dicts written by TRACE_EXPORT=file.
+    """
+    spans = []
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for s in scope_spans.get("spans", []):
+                start, end = int(s["startTimeUnixNano"]), int(s["endTimeUnixNano"])
+                status = s.get("status", {})
+                spans.append({
+                    "trace_id": s["traceId"], "span_id": s["spanId"], "parent_id": s.get("parentSpanId") or None,
+                    "name": s["name"], "kind": KIND_NAMES.get(s.get("kind"), "internal"),
+                    "start_ns": start, "end_ns": end, "duration_ms": round((end - start) / 1e6, 3),
+                    "attributes": {a["key"]: _attr_value(a["value"]) for a in s.get("attributes", [])},
+                    "error": status.get("message") if status.get("code") == 2 else None
+                })
+    return spans
+
+def load_traces(path):
+    traces = OrderedDict()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+def render(spans, width=40):
+    """
+    Text waterfall: offset and duration relative to the trace start, indented by parent.
+    Spans that start after the root span ended are marked as post-response tail work.
+    """
+    spans = sorted(spans, key=lambda s: s["start_ns"])
+    by_id = {s["span_id"]: s for s in spans}
+    roots = [s for s in spans if s["parent_id"] not in by_id]
+    t0 = spans[0]["start_ns"]
+    total = max(s["end_ns"] for s in spans) - t0 or 1
+    root_end = roots[0]["end_ns"] if roots else None
+
+    def depth(s):
+        d = 0
+        while s["parent_id"] in by_id:
+            s, d = by_id[s["parent_id"]], d + 1
+        return d
+
+    lines = [f"trace {spans[0]['trace_id']}  ({total / 1e6:.1f} ms, {len(spans)} spans)"]
+    for s in spans:
+        offset = s["start_ns"] - t0
+        bar_start = int(offset / total * width)
+        bar_len = max(1, int((s["end_ns"] - s["start_ns"]) / total * width))
+        bar = " " * bar_start + "█" * bar_len
+        tail = "  [after response]" if root_end and s["start_ns"] >= root_end else ""
+        error = f"  ❌ {s['error']}" if s.get("error") else ""
+        label = "  " * depth(s) + s["name"]
+        lines.append(f"{offset / 1e6:9.1f} ms {s['duration_ms']:9.1f} ms  |{bar:<{width}}|  {label}{tail}{error}")
+    return "\n".join(lines)
+
+def serve(args):
+    write_lock = threading.Lock()
+    if os.path.dirname(args.out):
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                spans = from_otlp(payload)
+                with write_lock, open(args.out, "a", encoding="utf-8") as f:
+                    for span in spans:
+                        f.write(json.dumps(span) + "\n")
+                for span in spans:
+                    if span["parent_id"] is None:
+                        print(f"📥 {span['name']}  {span['duration_ms']:.1f} ms  trace={span['trace_id']}")
+                status, body = 200, b"{}"
+            except Exception as e:
+                status, body = 400, json.dumps({"error": str(e)}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    print(f"📡 Trace collector on http://127.0.0.1:{args.port}/v1/traces -> {args.out}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def show(args):
+    traces = load_traces(args.file)
+    if args.trace:
+        selected = [traces[args.trace]] if args.trace in traces else []
+    else:
+        selected = list(traces.values())[-args.last:]
+    for spans in selected:
+        print(render(spans) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OTLP collector stand-in and trace viewer.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--port", type=int, default=4318)
+    p_serve.add_argument("--out", default=os.path.join("data", "collected_traces.jsonl"))
+
+    p_show = sub.add_parser("show")
+    p_show.add_argument("file")
+    p_show.add_argument("--trace")
+    p_show.add_argument("--last", type=int, default=3)
+
+    args = parser.parse_args()
+    serve(args) if args.command == "serve" else show(args)
@@ -0,0 +1,161 @@
+"""
+Throughput vs. uvicorn worker count, and a cross-process read test of the shared cache.
+
+    python backend_scripts/worker_bench.py http --workers 1 2 4 --duration 15
+    python backend_scripts/worker_bench.py http --workers 1 4 --path "/webhook/verify-email?email=jana%40gmail.com"
+    python backend_scripts/worker_bench.py cache --procs 1 2 4 --duration 5
+
+`http` starts the real app (uvicorn backend.main_router:app --workers N) per worker count, waits for
+/readyz, then drives it from several client processes over keep-alive connections. Rate limiting,
+tracing and the startup image build are switched off so the numbers show request-handling capacity.
+Run it on a machine with at least as many cores as the largest worker count plus the clients.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import http.client
+import multiprocessing
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ["/webhook/verify-email?email=jana%40gmail.com", "/readyz"]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def _client_thread(port, paths, deadline):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors, i = [], 0, 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Host": "localhost"})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.close()
+    return latencies, errors
+
+def _client_process(args):
+    port, paths, duration, threads = args
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda _: _client_thread(port, paths, deadline), range(threads)))
+    return [l for lat, _ in results for l in lat], sum(err for _, err in results)
+
+def wait_ready(port, server, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/readyz", timeout=2) as response:
+                if response.status == 200:
+                    return json.loads(response.read())
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server did not become ready")
+
+def bench_http(args):
+    cache_path = os.path.join(tempfile.mkdtemp(prefix="worker_bench_"), "shared_cache.sqlite")
+    rows = []
+    for workers in args.workers:
+        env = {**os.environ, "WEB_CONCURRENCY": str(workers), "RATE_LIMIT_ENABLED": "false",
+               "TRACE_EXPORT": "", "PROFILE_SAMPLE_RATE": "0", "LOG_LEVEL": "WARNING",
+               "IMAGE_PIPELINE_ON_STARTUP": "false", "SHARED_CACHE_PATH": cache_path}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main_router:app", "--host", "127.0.0.1",
+             "--port", str(args.port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+            cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL if not args.verbose else None, stderr=subprocess.STDOUT
+        )
+        try:
+            wait_ready(args.port, server)
+            time.sleep(args.settle)  # let the other workers finish their warm-up too
+            with multiprocessing.Pool(args.clients) as pool:
+                results = pool.map(_client_process, [(args.port, args.path, args.duration, args.threads)] * args.clients)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        latencies = [l for lat, _ in results for l in lat]
+        errors = sum(err for _, err in results)
+        rps = len(latencies) / args.duration
+        rows.append((workers, rps, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000, errors))
+        print(f"workers={workers}: {rps:,.0f} req/s", flush=True)
+        time.sleep(1)
+    report(rows, "workers")
+
+def _cache_reader(args):
+    path, duration = args
+    sys.path.insert(0, ROOT_DIR)
+    from backend.utils.shared_cache import SharedCache
+    cache = SharedCache(path=path)
+    deadline, reads, i = time.monotonic() + duration, 0, 0
+    while time.monotonic() < deadline:
+        cache.get(f"dns:domain{i % 500}.sk")
+        cache.get("tony:system_prompt:bench")
+        reads += 2
+        i += 1
+    return reads
+
+def bench_cache(args):
+    sys.path.insert(0, ROOT_DIR)
+    from backend.utils.shared_cache import SharedCache
+    path = os.path.join(tempfile.mkdtemp(prefix="cache_bench_"), "shared_cache.sqlite")
+    cache = SharedCache(path=path)
+    for i in range(500):
+        cache.set(f"dns:domain{i}.sk", True, ttl=3600)
+    cache.set("tony:system_prompt:bench", "x" * 6500, ttl=3600)  # about the size of prompt + knowledge base
+    rows = []
+    for procs in args.procs:
+        with multiprocessing.Pool(procs) as pool:
+            reads = sum(pool.map(_cache_reader, [(path, args.duration)] * procs))
+        rows.append((procs, reads / args.duration, None, None, 0))
+        print(f"procs={procs}: {reads / args.duration:,.0f} reads/s", flush=True)
+    report(rows, "procs")
+
+def report(rows, label):
+    base = rows[0][1] or 1
+    print(f"\n{label:>8} {'per sec':>12} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for n, rate, p50, p99, errors in rows:
+        p50 = f"{p50:8.2f}" if p50 is not None else f"{'-':>8}"
+        p99 = f"{p99:8.2f}" if p99 is not None else f"{'-':>8}"
+        print(f"{n:>8} {rate:>12,.0f} {rate / base:>7.2f}x {p50} {p99} {errors:>7}")
+    print(f"\n(cpu count: {os.cpu_count()})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker scaling and shared cache benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_http = sub.add_parser("http")
+    p_http.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p_http.add_argument("--port", type=int, default=8055)
+    p_http.add_argument("--path", nargs="+", default=DEFAULT_PATHS)
+    p_http.add_argument("--duration", type=float, default=15)
+    p_http.add_argument("--clients", type=int, default=max(2, (os.cpu_count() or 2) // 2))
+    p_http.add_argument("--threads", type=int, default=8)
+    p_http.add_argument("--settle", type=float, default=3)
+    p_http.add_argument("--verbose", action="store_true")
+
+    p_cache = sub.add_parser("cache")
+    p_cache.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4])
+    p_cache.add_argument("--duration", type=float, default=5)
+
+    args = parser.parse_args()
+    bench_http(args) if args.command == "http" else bench_cache(args)
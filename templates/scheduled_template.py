@@ -1,13 +1,20 @@
 import os
+import sys
+import asyncio
 import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Make the backend package importable when running this template directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.utils.scheduler import AsyncScheduler, IntervalTrigger, CronTrigger
+
 def run_scheduled_task():
     """
     Standard entry point for scheduled triggers.
+    Register it on the in-process scheduler (see register) instead of a separate cron process.
     """
     try:
         now = datetime.datetime.now()
@@ -23,5 +30,23 @@ def run_scheduled_task():
         print(f"Error in scheduled task: {e}")
         return {"status": "error", "message": str(e)}
 
+def register(scheduler: AsyncScheduler):
+    """
+    Interval: IntervalTrigger(seconds, jitter=...). Cron: CronTrigger("0 8 * * 1-5", jitter=...).
+    single_instance=True holds a Postgres advisory lock, so only one worker runs the job.
+    """
+    scheduler.add_job("template_task", run_scheduled_task, IntervalTrigger(300, jitter=30), single_instance=False)
+
 if __name__ == "__main__":
+    # Local test: run once, then on a short interval until interrupted
     run_scheduled_task()
+
+    async def main():
+        scheduler = AsyncScheduler()
+        scheduler.add_job("template_task", run_scheduled_task, IntervalTrigger(5, jitter=1), single_instance=False)
+        scheduler.start()
+        await asyncio.sleep(12)
+        print(scheduler.get_metrics())
+        await scheduler.stop()
+
+    asyncio.run(main())
@@ -1,22 +1,38 @@
 import os
+import sys
 import json
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def handle_webhook(payload):
+# Make the backend package importable when running this template directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.utils.ingest_queue import get_default_queue
+
+def process_payload(payload):
+    """
+    Worker-side logic for a queued webhook (e.g. call execution layer scripts, write to Postgres).
+    Return True on success; False or an exception makes the queue retry, then dead-letter.
+    """
+    print(f"Processing payload: {json.dumps(payload, indent=2)}")
+    return True
+
+def handle_webhook(payload, kind="generic"):
     """
     Standard entry point for webhook triggers.
+    Validates, appends the payload to the durable ingest queue and acks immediately.
     """
     try:
-        print(f"Received payload: {json.dumps(payload, indent=2)}")
-        
         # 1. Validate Payload
-        # 2. Logic (e.g., call execution layer scripts)
+        if not isinstance(payload, dict):
+            raise ValueError("Payload must be a JSON object")
+
+        # 2. Durably record (local WAL) - the queue workers run process_payload later
+        job_id = get_default_queue().enqueue(kind, payload)
+
         # 3. Return result
-        
-        return {"status": "success", "data": "Processed successfully"}
+        return {"status": "success", "data": "Queued for processing", "job_id": job_id}
         
     except Exception as e:
         print(f"Error processing webhook: {e}")
@@ -24,5 +40,9 @@ def handle_webhook(payload):
 
 if __name__ == "__main__":
     # Local testing example
+    queue = get_default_queue()
+    queue.register("generic", process_payload)
     test_payload = {"test": "data"}
     print(handle_webhook(test_payload))
+    queue.process_batch()
+    print(queue.get_stats())
@@ -0,0 +1,43 @@
+import pytest
+
+from backend.utils.intent_classifier import LocalIntentFastPath, classify_intent
+
+
+@pytest.mark.parametrize("message", [
+    "dobry den, chcem zrusit termin",
+    "I can not call",
+    "I can't call",
+    "presunut termin",
+    "I want to reschedule the call",
+    "nechcem termin",
+    "chcem rezervovat termin na piatok",
+    "ahoj tony ako sa mas",
+])
+def test_cancellations_negations_and_extra_content_go_to_llm(message):
+    assert classify_intent(message) == (None, 0.0)
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("ahoj", "greeting"),
+    ("good morning", "greeting"),
+    ("Ďakujem veľmi pekne", "thanks"),
+    ("thank you so much", "thanks"),
+    ("ahoj, chcem si rezervovať termín", "booking"),
+    ("I want to book a call please", "booking"),
+    ("aké sú otváracie hodiny?", "hours"),
+])
+def test_trivial_messages_are_classified(message, intent):
+    assert classify_intent(message)[0] == intent
+
+
+@pytest.mark.parametrize("message", ["ahoj", "ďakujem", "chcem termín"])
+def test_templates_only_open_a_conversation(message):
+    fast_path = LocalIntentFastPath(enabled=True)
+    history = [{"type": "user", "text": "Koľko stojí automatizácia?"}, {"type": "bot", "text": "..."}]
+    assert fast_path.respond(message, "sk", history=history) is None
+    assert fast_path.respond(message, "sk", history=[])["source"] == "local"
+
+
+def test_english_greeting_is_answered_in_english():
+    fast_path = LocalIntentFastPath(enabled=True)
+    assert fast_path.respond("hi")["lang"] == "en"